@@ -0,0 +1,337 @@
+import constant as C
+from bitboard import BitBoard, CELLS, WIN_MASKS
+from board import Board
+from strategy import Strategy
+from collections import OrderedDict
+from contextlib import ExitStack
+import argparse
+import json
+import numpy as np
+import sys
+
+# characters accepted for each piece in text boards
+PIECES = {'X': 0, 'O': 1, '.': -1, '-': -1, '_': -1}
+
+# columns of the binary columnar format, written in this order for every block
+COLUMNS = ('board', 'player', 'payoffs', 'samples', 'errors', 'dominant', 'equilibrium', 'value')
+
+
+def parse_board(line: str) -> np.ndarray:
+    """
+    Reads a board state written either as a JSON list of -1 (empty), 0 (X) and 1 (O), flat or by row,
+    or as ROWS * COLUMNS characters of X, O and '.', '-' or '_' for empty positions
+    :param line: a single line of input
+    :return: flat board state
+    """
+    line = line.strip()
+    if line.startswith('['):
+        state = np.asarray(json.loads(line), dtype=np.int8).ravel()
+    else:
+        try:
+            state = np.array([PIECES[piece] for piece in line.upper()], dtype=np.int8)
+        except KeyError as error:
+            raise ValueError(f'{error.args[0]!r} is not a piece, use X, O or one of . - _ for empty positions')
+
+    if state.size != CELLS or state.min(initial=0) < -1 or state.max(initial=0) > 1:
+        raise ValueError(f'a board needs {CELLS} positions of -1, 0 or 1')
+    return state
+
+
+def read_boards(lines) -> iter:
+    """
+    Parses boards from lines of text, skipping blank lines
+    :param lines: iterable of lines, e.g. an open file or stdin
+    :return: yields (line, board state or the ValueError raised while parsing it)
+    """
+    for line in lines:
+        if not line.strip():
+            continue
+        try:
+            yield line.strip(), parse_board(line)
+        except ValueError as error:
+            yield line.strip(), error
+
+
+def random_boards(count: int) -> iter:
+    """
+    Generates boards with random_board, MOVES moves into a game
+    :param count: number of boards to generate
+    :return: yields (description, board state)
+    """
+    for _ in range(count):
+        board = BitBoard(child=True)
+        board.random_board()
+        state = board.state.ravel().astype(np.int8)
+        yield ''.join(Board.piece(value) if value >= 0 else '.' for value in state), state
+
+
+def read_columnar(stream) -> iter:
+    """
+    Reads back the blocks written by ColumnarWriter
+    :param stream: binary file opened for reading
+    :return: yields a dictionary of column name to array per block
+    """
+    while True:
+        try:
+            yield {column: np.load(stream) for column in COLUMNS}
+        except (EOFError, ValueError):
+            return
+
+
+class JsonWriter:
+    """
+    Writes one JSON object per line
+    """
+
+    def __init__(self, stream):
+        """
+        :param stream: text file the results are written to
+        """
+        self.stream = stream
+
+    def write(self, record: dict):
+        """
+        Writes a result as a line of JSON
+        :param record: result of Analysis.analyze
+        """
+        self.stream.write(json.dumps(self.serialize(record)) + '\n')
+
+    def error(self, line: str, message: str):
+        """
+        Writes a board that could not be analyzed as a line of JSON, in place of its result
+        :param line: the board as it was read
+        :param message: why the board could not be analyzed
+        """
+        self.stream.write(json.dumps({'board': line, 'error': message}) + '\n')
+
+    def close(self):
+        """
+        Flushes the stream, leaving it open
+        """
+        self.stream.flush()
+
+    @staticmethod
+    def serialize(record: dict) -> dict:
+        """
+        Converts the record's arrays to JSON values, absent payoffs becoming null
+        :param record: result of Analysis.analyze
+        :return: JSON-serializable dictionary
+        """
+        first, second = record['player'], 1 - record['player']
+        payoffs = [[None if np.isnan(payoff[0]) else [int(p) if float(p).is_integer() else float(p) for p in payoff]
+                    for payoff in row] for row in record['payoffs']]
+        errors = [[None if np.isnan(error[0]) else [round(float(e), 4) for e in error] for error in row]
+                  for row in record['errors']]
+        equilibrium = None
+        if not np.isnan(record['value']):
+            equilibrium = {Board.piece(first): [round(float(p), 6) for p in record['equilibrium'][0]],
+                           Board.piece(second): [round(float(p), 6) for p in record['equilibrium'][1]],
+                           'value': round(float(record['value']), 6)}
+        return {
+            'board': record['board'].tolist(),
+            'player': Board.piece(first),
+            'payoffs': payoffs,
+            'samples': record['samples'].tolist(),
+            'errors': errors,
+            'dominant': {Board.piece(first): np.flatnonzero(record['dominant'][0]).tolist(),
+                         Board.piece(second): np.flatnonzero(record['dominant'][1]).tolist()},
+            'equilibrium': equilibrium,
+            'cached': record['cached'],
+        }
+
+
+class ColumnarWriter:
+    """
+    Writes results in blocks of block_size records, each block being one .npy array per column, so a corpus
+    is written and read back one block at a time. Boards that could not be analyzed are reported on stderr.
+    """
+
+    def __init__(self, stream, block_size: int=1024):
+        """
+        :param stream: binary file the blocks are written to
+        :param block_size: most records in a block
+        """
+        self.stream = stream
+        self.block_size = block_size
+        self.block = {column: [] for column in COLUMNS}
+
+    def write(self, record: dict):
+        """
+        Adds a result to the current block, writing the block once it is full
+        :param record: result of Analysis.analyze
+        """
+        for column in COLUMNS:
+            self.block[column].append(record[column])
+        if len(self.block['board']) >= self.block_size:
+            self.flush()
+
+    def error(self, line: str, message: str):
+        """
+        Reports a board that could not be analyzed on stderr, as the columnar format has no place for it
+        :param line: the board as it was read
+        :param message: why the board could not be analyzed
+        """
+        print(f'{line}: {message}', file=sys.stderr)
+
+    def flush(self):
+        """
+        Writes the records of the current block, one array per column, and starts a new block
+        """
+        if self.block['board']:
+            for column in COLUMNS:
+                np.save(self.stream, np.stack(self.block[column]))
+                self.block[column] = []
+
+    def close(self):
+        """
+        Writes the last, partly filled block and flushes the stream, leaving it open
+        """
+        self.flush()
+        self.stream.flush()
+
+
+class Analysis:
+    """
+    Runs the Strategy pipeline over a stream of boards. Results of recently analyzed boards are kept in a
+    least-recently-used cache bounded by the memory of their arrays, which grow with the square of the board's
+    cells, so repeated boards are only analyzed once and memory stays bounded on any board size.
+    """
+
+    def __init__(self, cache_bytes: int=256 << 20, unique: bool=False):
+        """
+        :param cache_bytes: most memory held by the arrays of the cached results, 0 to cache nothing
+        :param unique: skips boards whose result is still in the cache instead of writing it again
+        """
+        self.cache = OrderedDict()
+        self.cache_bytes = cache_bytes
+        self.cache_used = 0
+        self.unique = unique
+        self.analyzed = 0
+        self.cached = 0
+
+    def analyze(self, state: np.ndarray) -> dict:
+        """
+        Analyzes a board, taking X to move first
+        :param state: flat board state
+        :return: record of the board, the player to move, the payoff matrix, sample counts and confidence interval
+                 half-widths of the X won, O won and stalemate proportions (nan if not sampled) laid out by strategy,
+                 each player's dominant strategies as a (2, TOTAL_STRATEGIES) mask, the mixed strategies of a Nash
+                 equilibrium as a (2, TOTAL_STRATEGIES) array with the first player's value (nan if none was found)
+                 and whether it came from the cache
+        """
+        key = state.tobytes()
+        if key in self.cache:
+            self.cache.move_to_end(key)
+            self.cached += 1
+            return dict(self.cache[key], cached=True)
+
+        x_count, o_count = int(np.count_nonzero(state == 0)), int(np.count_nonzero(state == 1))
+        if x_count - o_count not in (0, 1):
+            raise ValueError(f'X moves first, so a board cannot have {x_count} X and {o_count} O pieces')
+
+        bitboard = BitBoard(state, current_player=x_count - o_count, child=True)
+        if any(mask & line == line for mask in bitboard.masks for line in WIN_MASKS):
+            raise ValueError('the game has already been won')
+        if not bitboard.empty:
+            raise ValueError('no legal moves remain')
+
+        board = bitboard if C.BITBOARD else Board(state.reshape((C.ROWS, C.COLUMNS)).astype(int),
+                                                  current_player=bitboard.current_player, child=True)
+        strategy = Strategy(board)
+        strategy.process()
+        strategy.compare_strategies()
+        table = strategy.payoff_table
+
+        dominant = np.zeros((2, C.TOTAL_STRATEGIES), dtype=bool)
+        for player, strategies in enumerate(strategy.find_dominant_strategies()):
+            dominant[player, strategies] = True
+
+        # the equilibrium with the smallest supports is kept, so every record has the same shape
+        equilibria = strategy.nash_equilibria()
+        equilibrium = np.full((2, C.TOTAL_STRATEGIES), np.nan, dtype=np.float32)
+        value = np.float32(np.nan)
+        if equilibria:
+            equilibrium[:] = equilibria[0][:2]
+            value = np.float32(equilibria[0][2])
+
+        record = {'board': state, 'player': np.int8(bitboard.current_player),
+                  'payoffs': table.payoffs.astype(np.float32), 'samples': table.samples.astype(np.int32),
+                  'errors': table.errors.astype(np.float32),
+                  'dominant': dominant, 'equilibrium': equilibrium, 'value': value, 'cached': False}
+        self.analyzed += 1
+
+        self.cache[key] = record
+        self.cache_used += self.size(record)
+        while self.cache and self.cache_used > self.cache_bytes:
+            self.cache_used -= self.size(self.cache.popitem(last=False)[1])
+        return record
+
+    @staticmethod
+    def size(record: dict) -> int:
+        """
+        :param record: record from analyze
+        :return: bytes held by the record's arrays
+        """
+        return sum(value.nbytes for value in record.values() if isinstance(value, (np.ndarray, np.generic)))
+
+    def run(self, boards: iter, writer: JsonWriter or ColumnarWriter):
+        """
+        Analyzes every board and writes each result as soon as it is known
+        :param boards: (line, board state or the error raised while parsing it) pairs
+        :param writer: JsonWriter or ColumnarWriter
+        """
+        for line, state in boards:
+            if isinstance(state, ValueError):
+                writer.error(line, str(state))
+                continue
+            if self.unique and state.tobytes() in self.cache:
+                continue
+
+            try:
+                record = self.analyze(state)
+            except ValueError as error:
+                writer.error(line, str(error))
+                continue
+            writer.write(record)
+        writer.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Analyzes the payoff tables and dominant strategies of many boards.')
+    parser.add_argument('input', nargs='?', default='-',
+                        help='file with one board per line, as a JSON list or a string such as X.O.X...O '
+                             '(default: stdin)')
+    parser.add_argument('-o', '--output', default='-', help='file to write results to (default: stdout)')
+    parser.add_argument('-f', '--format', choices=('jsonl', 'columnar'), default='jsonl',
+                        help='one JSON object per line, or blocks of .npy columns')
+    parser.add_argument('-r', '--random', type=int, metavar='N',
+                        help='analyze N boards from random_board instead of reading any input')
+    parser.add_argument('--cache', type=float, default=256, metavar='MIB',
+                        help='most memory in MiB held by the results kept for repeated boards (default: 256)')
+    parser.add_argument('--unique', action='store_true', help='skip boards whose result is already cached')
+    parser.add_argument('--block', type=int, default=1024, help='records per block of the columnar format')
+    args = parser.parse_args()
+
+    # files opened here are closed once every board is written, stdin and stdout are left open
+    with ExitStack() as files:
+        if args.random is not None:
+            boards = random_boards(args.random)
+        elif args.input == '-':
+            boards = read_boards(sys.stdin)
+        else:
+            boards = read_boards(files.enter_context(open(args.input)))
+
+        binary = args.format == 'columnar'
+        if args.output == '-':
+            stream = sys.stdout.buffer if binary else sys.stdout
+        else:
+            stream = files.enter_context(open(args.output, 'wb' if binary else 'w'))
+
+        writer = ColumnarWriter(stream, args.block) if binary else JsonWriter(stream)
+        analysis = Analysis(int(args.cache * (1 << 20)), args.unique)
+        analysis.run(boards, writer)
+    print(f'boards analyzed: {analysis.analyzed}, results from the cache: {analysis.cached}', file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,343 @@
+import constant as C
+from board import Board
+from bitboard import BitBoard
+from profiler import Profiler
+from strategy import Strategy
+from table import Table
+from copy import deepcopy
+from datetime import datetime, timezone
+from time import perf_counter
+import argparse
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import tracemalloc
+import numpy as np
+
+
+def make_board(moves: int=None) -> Board or BitBoard:
+    """
+    Creates a board with the engine selected by BITBOARD
+    :param moves: number of random moves into the game, or None for the static board
+    :return: the board, with X moving next on the static board
+    """
+    board = BitBoard(child=True)
+    if moves is None:
+        board.static_board()
+    else:
+        C.MOVES = moves
+        board.random_board()
+
+    if C.BITBOARD:
+        return board
+    return Board(board.state, board.move_count, board.current_player, child=True)
+
+
+def find_boards(moves: [int], static: bool=True) -> [(str, int, Board or BitBoard)]:
+    """
+    :param moves: numbers of moves into the game of the random boards
+    :param static: also includes the static board, which only exists on a 3x3 board
+    :return: (name, moves into the game, board) for each representative board
+    """
+    boards = [(f'random-{m}', m, make_board(m)) for m in moves if 0 <= m <= C.TOTAL_STRATEGIES - 2]
+    if static and C.TOTAL_STRATEGIES == 9:
+        boards.append(('static', 3, make_board()))
+    return boards
+
+
+def find_cell(board: Board or BitBoard) -> (Board or BitBoard, int, int):
+    """
+    Finds the first cell of the payoff table that is still in play, as process_children would sample it
+    :param board: root board
+    :return: (board of the cell, piece added last, where it was added), or None if every cell has ended
+    """
+    for child, piece, _, legal_positions in board.copy().discover_children() or []:
+        if child.end_game:
+            continue
+        for position in legal_positions:
+            cell = child.copy()
+            _, winner = cell.add_piece(1 - piece, position)
+            if winner == 2 and cell.legal_move() != -1:
+                return cell, 1 - piece, position
+    return None
+
+
+class Benchmark:
+    """
+    Times the stages of the pipeline on representative boards, from building children to laying out the
+    human-readable payoff table, and records rollout throughput, latency percentiles and peak memory
+    """
+
+    def __init__(self, repeat: int=20, samples: int=None, memory: bool=True):
+        """
+        :param repeat: timed calls per benchmark and board
+        :param samples: rollouts per cell of the payoff table, C.SAMPLES by default
+        :param memory: also runs every benchmark once under tracemalloc to find its peak memory
+        """
+        self.repeat = repeat
+        self.samples = C.SAMPLES if samples is None else samples
+        self.memory = memory
+        self.results = []
+        self.profiles = {}
+
+    def measure(self, benchmark: str, board: str, run, setup=None, rollouts: int=0, repeat: int=None) -> dict:
+        """
+        Times every call of run separately, so setup such as copying a board is left out of the timings
+        :param benchmark: name of the benchmark
+        :param board: name of the board
+        :param run: function to time
+        :param setup: function returning the arguments of each call of run, no arguments by default
+        :param rollouts: rollouts played by each call of run
+        :param repeat: timed calls, self.repeat by default
+        :return: the recorded result
+        """
+        repeat = self.repeat if repeat is None else repeat
+        setup = setup if setup is not None else tuple
+
+        seconds = []
+        for _ in range(repeat):
+            arguments = setup()
+            start = perf_counter()
+            run(*arguments)
+            seconds.append(perf_counter() - start)
+
+        result = {'benchmark': benchmark, 'board': board, 'latency': Profiler.latency(seconds)}
+        if rollouts:
+            result['rollouts'] = rollouts * repeat
+            result['rollouts_per_sec'] = rollouts * repeat / max(sum(seconds), 1e-12)
+
+        # tracemalloc slows every allocation down, so peak memory is found in a separate untimed call
+        if self.memory:
+            arguments = setup()
+            tracemalloc.start()
+            run(*arguments)
+            result['peak_memory'] = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+
+        self.results.append(result)
+        return result
+
+    def run(self, boards: [(str, int, Board or BitBoard)]):
+        """
+        Runs every benchmark on every board
+        :param boards: boards from find_boards
+        """
+        for name, _, board in boards:
+            self.children(name, board)
+            self.moves(name, board)
+            self.sampling(name, board)
+            self.pipeline(name, board)
+
+    def children(self, name: str, board: Board or BitBoard):
+        """
+        Times discover_children on a fresh copy of the board
+        :param name: name of the board in the results
+        :param board: board to benchmark
+        """
+        self.measure('discover_children', name, lambda root: root.discover_children(),
+                     setup=lambda: (board.copy(),))
+
+    def moves(self, name: str, board: Board or BitBoard):
+        """
+        Times adding the current player's piece to the first legal position, and checking the move for a win
+        :param name: name of the board in the results
+        :param board: board to benchmark
+        """
+        position = board.collect_legal_positions()[0]
+        piece = board.get_current_player()
+
+        def moved() -> (Board or BitBoard, int, int):
+            """
+            :return: a copy of the board with the move added, the piece and the position of the move
+            """
+            moved_board = board.copy()
+            moved_board.add_piece(piece, position)
+            return moved_board, piece, position
+
+        self.measure('add_piece', name, lambda copy: copy.add_piece(piece, position), setup=lambda: (board.copy(),))
+        self.measure('winning_state', name, lambda copy, *move: copy.winning_state(*move), setup=moved)
+
+    def sampling(self, name: str, board: Board or BitBoard):
+        """
+        Times runs of single rollouts and monte_carlo_sampling on the board of a payoff table cell still in play.
+        Boards without such a cell are skipped.
+        :param name: name of the board in the results
+        :param board: board to benchmark
+        """
+        cell = find_cell(board)
+        if cell is None:
+            return
+        cell_board, piece, position = cell
+        strategy = Strategy(cell_board)
+
+        # a single rollout is too short to time reliably, so each call plays a run of them
+        runs = 100
+        if isinstance(cell_board, BitBoard):
+            self.measure('sample_run', name, lambda: [strategy.sample_run(cell_board) for _ in range(runs)],
+                         rollouts=runs)
+        else:
+            self.measure('sample_run', name, lambda copies: [strategy.sample_run(copy) for copy in copies],
+                         setup=lambda: ([deepcopy(cell_board) for _ in range(runs)],), rollouts=runs)
+
+        self.measure('monte_carlo_sampling', name,
+                     lambda: strategy.monte_carlo_sampling(cell_board, piece, position, samples=self.samples),
+                     rollouts=self.samples)
+
+    def pipeline(self, name: str, board: Board or BitBoard):
+        """
+        Times the whole Strategy pipeline on the board, then nash_equilibria and the table of its payoffs,
+        and keeps a profile of the stages of the pipeline
+        :param name: name of the board in the results and profiles
+        :param board: board to benchmark
+        """
+        def process(profiler: Profiler=None) -> Strategy:
+            """
+            :param profiler: Profiler that counts the work of the run, if any
+            :return: the strategy after sampling its payoff table and comparing its strategies
+            """
+            strategy = Strategy(board.copy(), profiler)
+            strategy.process()
+            strategy.compare_strategies()
+            return strategy
+
+        # process samples every cell, so it runs fewer times than the cheaper stages, always without a profiler
+        result = self.measure('process', name, process, repeat=max(1, self.repeat // 4))
+
+        # a separate profiled run finds the counters and the time spent in each stage
+        profiler = Profiler()
+        process(profiler)
+        self.profiles[name] = profiler.summary()
+        rollouts = profiler.counters['rollouts']
+        if rollouts:
+            result['rollouts'] = rollouts * result['latency']['calls']
+            result['rollouts_per_sec'] = result['rollouts'] / max(result['latency']['total'], 1e-12)
+
+        strategy = process()
+        self.measure('nash_equilibria', name, strategy.nash_equilibria, repeat=max(1, self.repeat // 4))
+        self.measure('create_human_readable_table', name, lambda table: table.create_human_readable_table(),
+                     setup=lambda: (Table(strategy.payoff_table),))
+
+    def scaling(self, boards: [(str, int, Board or BitBoard)], workers: [int]):
+        """
+        Times Strategy.process on each board with the payoff table sampled serially and on process pools of
+        each size, recording the speedup of every pool over the serial run
+        :param boards: boards from find_boards
+        :param workers: pool sizes to time, 1 for the serial run
+        """
+        parallel, pool_size = C.PARALLEL, C.WORKERS
+        for name, _, board in boards:
+            serial = None
+            for count in sorted(set(workers) | {1}):
+                C.PARALLEL, C.WORKERS = count > 1, count
+
+                # the pool is started by an untimed run, as it is kept for the life of the process
+                Strategy(board.copy()).process()
+                result = self.measure(f'process x{count}', name, lambda: Strategy(board.copy()).process(),
+                                      repeat=max(1, self.repeat // 4))
+                result['workers'] = count
+                serial = serial or result['latency']['p50']
+                result['scaling'] = serial / max(result['latency']['p50'], 1e-12)
+        C.PARALLEL, C.WORKERS = parallel, pool_size
+
+    def report(self) -> dict:
+        """
+        :return: JSON-serializable results along with the settings and environment they were measured in
+        """
+        return {
+            'commit': find_commit(),
+            'created': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'platform': platform.platform(),
+            'cpus': os.cpu_count(),
+            'settings': {name: getattr(C, name) for name in ('ROWS', 'COLUMNS', 'IN_A_ROW', 'SAMPLES', 'BITBOARD',
+                                                             'BATCH', 'ADAPTIVE', 'PARALLEL', 'WORKERS', 'EXACT',
+                                                             'SEED')},
+            'repeat': self.repeat,
+            'results': self.results,
+            'profiles': self.profiles,
+        }
+
+    def display(self, previous: dict=None):
+        """
+        Prints the median latency and throughput of every benchmark
+        :param previous: report of an earlier run to compare the median latencies with
+        """
+        baseline = {(r['benchmark'], r['board']): r['latency']['p50'] for r in (previous or {}).get('results', [])}
+
+        print(f'{"benchmark":<28}{"board":<11}{"p50 ms":>11}{"p99 ms":>11}{"rollouts/s":>13}{"peak KiB":>10}'
+              + (f'{"speedup":>9}' if previous else ''))
+        for result in self.results:
+            latency = result['latency']
+            line = (f'{result["benchmark"]:<28}{result["board"]:<11}{latency["p50"] * 1000:>11.4f}'
+                    f'{latency["p99"] * 1000:>11.4f}'
+                    f'{format(result["rollouts_per_sec"], ",.0f") if "rollouts_per_sec" in result else "":>13}'
+                    f'{result.get("peak_memory", 0) / 1024:>10.1f}')
+            before = baseline.get((result['benchmark'], result['board']))
+            if before:
+                line += f'{before / max(latency["p50"], 1e-12):>8.2f}x'
+            print(line)
+
+        scaling = [result for result in self.results if 'scaling' in result]
+        if scaling:
+            print(f'\n{"scaling":<28}{"board":<11}{"workers":>11}{"p50 ms":>11}{"speedup":>13}')
+            for result in scaling:
+                print(f'{result["benchmark"]:<28}{result["board"]:<11}{result["workers"]:>11}'
+                      f'{result["latency"]["p50"] * 1000:>11.2f}{result["scaling"]:>12.2f}x')
+
+
+def find_commit() -> str or None:
+    """
+    :return: the commit the benchmark was run on, if it was run from a git checkout
+    """
+    try:
+        return subprocess.run(['git', 'rev-parse', 'HEAD'], capture_output=True, text=True, check=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmarks the sampling pipeline on representative boards.')
+    parser.add_argument('-o', '--output', default='benchmark.json', help='file to write the results to')
+    parser.add_argument('-n', '--repeat', type=int, default=20, help='timed calls per benchmark and board')
+    parser.add_argument('-s', '--samples', type=int, help='rollouts per payoff table cell (default: SAMPLES)')
+    parser.add_argument('-m', '--moves', type=int, nargs='+', default=list(range(8)),
+                        help='moves into the game of the random boards (default: 0 to 7)')
+    parser.add_argument('--seed', type=int, default=0, help='seed of the boards and of sampling')
+    parser.add_argument('--engine', choices=('bitboard', 'numpy'), help='board engine (default: BITBOARD)')
+    parser.add_argument('--no-memory', action='store_true', help='skip measuring peak memory')
+    parser.add_argument('--compare', metavar='FILE', help='results of an earlier run to compare with')
+    parser.add_argument('-w', '--workers', type=int, nargs='+', metavar='N',
+                        help='also times Strategy.process on process pools of these sizes to measure scaling')
+    args = parser.parse_args()
+
+    if args.engine is not None:
+        C.BITBOARD = args.engine == 'bitboard'
+    if args.samples is not None:
+        C.SAMPLES = args.samples
+    C.SEED = args.seed
+    random.seed(args.seed)
+
+    benchmark = Benchmark(args.repeat, memory=not args.no_memory)
+    boards = find_boards(args.moves)
+    benchmark.run(boards)
+    if args.workers:
+        benchmark.scaling(boards, args.workers)
+
+    previous = None
+    if args.compare:
+        with open(args.compare) as file:
+            previous = json.load(file)
+    benchmark.display(previous)
+
+    with open(args.output, 'w') as file:
+        json.dump(benchmark.report(), file, indent=2)
+    print(f'\nresults written to {args.output}', file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,410 @@
+import constant as C
+import random
+from random import Random
+import numpy as np
+
+# board geometry shared by every BitBoard
+CELLS = C.ROWS * C.COLUMNS
+FULL = (1 << CELLS) - 1
+
+
+def find_win_masks() -> (int,):
+    """
+    Builds a bitmask for every horizontal, vertical and diagonal line of IN_A_ROW positions on the board
+    :return: tuple of winning line masks
+    """
+    masks = []
+    for row in range(C.ROWS):
+        for column in range(C.COLUMNS):
+            for row_step, column_step in ((0, 1), (1, 0), (1, 1), (1, -1)):
+                last_row = row + row_step * (C.IN_A_ROW - 1)
+                last_column = column + column_step * (C.IN_A_ROW - 1)
+                if last_row < C.ROWS and 0 <= last_column < C.COLUMNS:
+                    masks.append(sum(1 << ((row + row_step * i) * C.COLUMNS + column + column_step * i)
+                                     for i in range(C.IN_A_ROW)))
+    return tuple(masks)
+
+
+def mask_positions(mask: int) -> (int,):
+    """
+    :param mask: bitmask of board positions
+    :return: tuple of the positions set in the mask, in ascending order
+    """
+    positions = []
+    while mask:
+        lowest = mask & -mask
+        positions.append(lowest.bit_length() - 1)
+        mask ^= lowest
+    return tuple(positions)
+
+
+WIN_MASKS = find_win_masks()
+
+# winning lines that pass through each position, so only those need checking after a move
+LINES_THROUGH = tuple(tuple(line for line in WIN_MASKS if line >> position & 1) for position in range(CELLS))
+
+
+class BitBoard:
+    """
+    Compact board that keeps each player's pieces as a bitmask, where bit i is board position i.
+    The empty positions are also kept in a list with each position's index in it, so moves are
+    added, undone and chosen at random in constant time on boards of any size.
+    Shares Board's interface so it can be used as a drop-in engine by Game and Strategy.
+    """
+    __slots__ = ('masks', 'empty', 'open', 'slot', 'move_count', 'current_player', 'end_game', 'winning_player',
+                 'children')
+
+    def __init__(self, state: []=None, move: int=0, current_player: int=0, child: bool=False):
+        """
+        :param state: board state to start from, where -1 is empty, 0 is X and 1 is O. An empty board by default,
+                      set up by random_board or static_board if RANDOM or STATIC is set and the board is no child
+        :param move: number of moves made on the board
+        :param current_player: piece of the player to move on a root board, or that just moved on a child board
+        :param child: True if the board is made from another board, so RANDOM does not apply
+        """
+        self.masks = [0, 0]                 # [X's pieces, O's pieces]
+        self.empty = FULL
+        self.open = list(range(CELLS))      # empty positions in no particular order
+        self.slot = list(range(CELLS))      # index of each empty position in open
+        self.move_count = move
+        self.current_player = current_player
+        self.end_game = False
+        self.winning_player = -1
+        self.children = []
+
+        if state is None:
+            # set board if specified
+            if C.RANDOM and not child:
+                self.random_board()
+            elif C.STATIC:
+                self.static_board()
+        else:
+            self.load_state(state)
+
+    @classmethod
+    def from_board(cls, board) -> 'BitBoard':
+        """
+        Converts any board exposing a state array into a BitBoard
+        :param board: Board or BitBoard
+        :return: equivalent BitBoard
+        """
+        bitboard = cls(board.state, board.move_count, board.current_player, child=True)
+        bitboard.end_game = board.end_game
+        bitboard.winning_player = board.winning_player
+        return bitboard
+
+    def load_state(self, state: [int]):
+        """
+        Sets the pieces from a board state where -1 is empty, 0 is X and 1 is O
+        :param state: 2-dimensional or flat board state
+        """
+        self.masks = [0, 0]
+        self.empty = FULL
+        for position, value in enumerate(np.asarray(state).ravel()):
+            if value >= 0:
+                bit = 1 << position
+                self.masks[value] |= bit
+                self.empty ^= bit
+        self.open = list(mask_positions(self.empty))
+        self.slot = [0] * CELLS
+        for index, position in enumerate(self.open):
+            self.slot[position] = index
+
+    @property
+    def state(self) -> np.ndarray:
+        """
+        :return: the board as a ROWS x COLUMNS array, matching Board.state
+        """
+        state = np.full(CELLS, -1, dtype=int)
+        for piece in (0, 1):
+            state[list(mask_positions(self.masks[piece]))] = piece
+        return state.reshape((C.ROWS, C.COLUMNS))
+
+    def copy(self) -> 'BitBoard':
+        """
+        :return: an independent copy of the board
+        """
+        board = BitBoard.__new__(BitBoard)
+        board.masks = self.masks[:]
+        board.empty = self.empty
+        board.open = self.open[:]
+        board.slot = self.slot[:]
+        board.move_count = self.move_count
+        board.current_player = self.current_player
+        board.end_game = self.end_game
+        board.winning_player = self.winning_player
+        board.children = []
+        return board
+
+    def play(self, piece: int, position: int) -> int:
+        """
+        Places a piece on an empty position without any legality checks
+        :param piece: piece to add (0 or 1)
+        :param position: empty position in which to add the piece
+        :return: the piece if it completed a line, 2 otherwise
+        """
+        bit = 1 << position
+        mask = self.masks[piece] | bit
+        self.masks[piece] = mask
+        self.empty ^= bit
+        self.current_player = piece
+
+        # swap the position with the last empty one so it can be popped
+        index = self.slot[position]
+        last = self.open.pop()
+        if last != position:
+            self.open[index] = last
+            self.slot[last] = index
+        self.move_count += 1
+
+        for line in LINES_THROUGH[position]:
+            if mask & line == line:
+                self.end_game = True
+                self.winning_player = piece
+                return piece
+        return 2
+
+    def undo(self, piece: int, position: int):
+        """
+        Reverts a play() of the piece at the position
+        :param piece: piece that was added
+        :param position: position the piece was added to
+        """
+        bit = 1 << position
+        self.masks[piece] ^= bit
+        self.empty |= bit
+        self.slot[position] = len(self.open)
+        self.open.append(position)
+        self.current_player = 1 - piece
+        self.move_count -= 1
+        self.end_game = False
+        self.winning_player = -1
+
+    def rollout(self, rng: Random=None, profiler=None) -> int:
+        """
+        Plays uniformly random moves, starting with the player after current_player, until the game ends.
+        The board itself is left unchanged.
+        :param rng: random generator for the moves, the global one by default
+        :param profiler: Profiler that counts the plies played, if any
+        :return: the winning piece (0 or 1), or -1 for a stalemate
+        """
+        uniform = rng.random if rng is not None else random.random
+        masks = self.masks[:]
+        player = self.current_player
+
+        # shuffle the empty positions one move at a time, moving each chosen position to the front
+        order = self.open[:]
+        remaining = len(order)
+        for move in range(remaining):
+            index = move + int(uniform() * (remaining - move))
+            position = order[index]
+            order[index] = order[move]
+
+            player = 1 - player
+            mask = masks[player] | 1 << position
+            masks[player] = mask
+            for line in LINES_THROUGH[position]:
+                if mask & line == line:
+                    if profiler is not None:
+                        profiler.count('plies', move + 1)
+                    return player
+
+        if profiler is not None:
+            profiler.count('plies', remaining)
+        return -1
+
+    def discover_children(self) -> []:
+        """
+        Generates a child state based on a specifc legal move being added to the parent board
+        :return all of the child states
+        """
+        self.children.clear()
+
+        legal_positions = self.collect_legal_positions()
+        if len(legal_positions) < 1:
+            return
+
+        piece = self.current_player
+        for position in legal_positions:
+            child = self.copy()
+            child.add_piece(piece=piece, position=position)
+            all_positions = [p for p in legal_positions if p != position]
+            self.children.append((child, piece, position, all_positions))
+
+        return self.children
+
+    def get_current_player(self) -> int:
+        """
+        :return returns the current player
+        """
+        return self.current_player
+
+    def winning_state(self, piece: int, position: int) -> (int, int):
+        """
+        Checks if the current board state is a winning state
+        :param piece: the piece that was placed (0 or 1)
+        :param position: the position of the last added piece
+        :return: (1, player's piece (0 or 1)) if player won, (1, 2) if game is still in play
+        """
+        mask = self.masks[piece]
+        for line in LINES_THROUGH[position]:
+            if mask & line == line:
+                self.winning_player = piece
+
+        # check if player won
+        if self.winning_player == piece:
+            self.end_game = True
+            return (1, piece)
+        return 1, 2
+
+    def add_piece(self, piece: int, position: int) -> (int, int):
+        """
+        Adds a piece to the board if the move is legal
+        :param piece: piece to add
+        :param position: position in which to add the piece
+        :return tuple (0, -1) if the game was stalemate,
+                tuple (1, player_piece) if won, 'player_piece' indicates the winner
+                tuple (1, 2) if game is continuing
+        """
+        self.current_player = piece
+
+        # no legal positions are available
+        if self.legal_move(position) == -1:
+            return 0, -1
+
+        self.play(piece, position)
+        return self.winning_state(piece, position)
+
+    def random_legal_move(self, rng: Random=None) -> int:
+        """
+        Generates a random legal move if there are any remaining
+        :param rng: random generator for the move, the global one by default
+        :return: legal position or -1 if no legal positions remain
+        """
+        if not self.open:
+            return -1
+        choice = rng.choice if rng is not None else random.choice
+        return choice(self.open)
+
+    def collect_legal_positions(self) -> [int]:
+        """
+        If there are any viable legal moves, their positions are returned
+        :return: list of legal positions
+        """
+        return sorted(self.open)
+
+    def legal_move(self, position: int=-2) -> int:
+        """
+        Check if any legal positions remain on the board, or if the specifically stated position is legal
+        :param position: a specific position or, by default, an invalid position of -2
+        :return: -1 if there are no more legal positions or the specific position is not legal,
+                 the position if it is legal,
+                 TOTAL_STRATEGIES if unspecified legal moves remain
+        """
+        # if there are no legal moves remaining
+        if not self.empty:
+            return -1
+
+        # if there are legal moves remaining, but the position wasn't specified
+        if position == -2:
+            return C.TOTAL_STRATEGIES
+
+        # if the position was specified, check if it is a legal move
+        if 0 <= position < CELLS and self.empty >> position & 1:
+            return position
+        return -1
+
+    def alternate_player(self, current_piece: int) -> int:
+        """
+        Alternates to the opposite piece
+        :param current_piece: value of current piece: 0 or 1
+        :return: alternate piece: 1 or 0
+        """
+        self.current_player = 0 if current_piece else 1
+        return self.current_player
+
+    def reset(self):
+        """
+        Clears the board back to an empty state
+        """
+        self.masks = [0, 0]
+        self.empty = FULL
+        self.open = list(range(CELLS))
+        self.slot = list(range(CELLS))
+        self.move_count = 0
+        self.current_player = 0
+        self.end_game = False
+        self.winning_player = -1
+
+    def random_board(self) -> int:
+        """
+        Creates a randomly generated, legal board that may be a set number of moves into a game
+        :return the piece of the current player
+        """
+        # if an invalid number of moves is selected, the board is not generated
+        if C.MOVES < 0 or C.MOVES > C.TOTAL_STRATEGIES - 2:
+            raise ValueError(f'{C.MOVES} in constant.py must be a value between [0,{C.TOTAL_STRATEGIES - 2}] '
+                             f'inclusively')
+
+        # place random pieces, starting over whenever a player wins before all the moves are made
+        self.reset()
+        piece = 0
+        while self.move_count < C.MOVES:
+            if self.play(piece, self.random_legal_move()) != 2:
+                self.reset()
+                piece = 0
+            else:
+                piece = 1 - piece
+
+        self.current_player = piece
+        return piece
+
+    def static_board(self) -> int:
+        """
+        Creates a statically set board: [0, -1, 1, -1, 0, -1, -1, -1, 1]
+
+                  X |   | O
+                  ---------
+        Board~>     | X |
+                  ---------
+                    |   | O
+
+        """
+        if C.TOTAL_STRATEGIES != 9:
+            raise ValueError('The static board is only defined for a 3x3 board, set RANDOM in constant.py instead')
+        self.load_state([0, -1, 1, -1, 0, -1, -1, -1, 1])
+        self.current_player = 0
+        return self.current_player
+
+    @staticmethod
+    def piece(value: int) -> str:
+        """
+        Convert integer value of piece into the string equivalent for the game
+         0 ~> 'X'
+         1 ~> 'O'
+        -2 ~> ' '
+        :param value: integer representation of piece
+        :return: string representation of piece
+        """
+        if value < 0:
+            return ' '
+        if value > 0:
+            return 'O'
+        return 'X'
+
+    def display(self):
+        """
+        Displays Tic Tac Toe as a 2-dimensional ROWS x COLUMNS board
+        """
+        line_break = 0
+        for row in self.state:
+            print(' | '.join(self.piece(value) for value in row))
+            if line_break < C.ROWS - 1:
+                print('-' * (4 * C.COLUMNS - 3))
+            line_break += 1
+
+    def display_flat(self):
+        """
+        Displays Tic Tac Toe as a flat list
+        """
+        print(f'board: {self.state.ravel()}')
@@ -0,0 +1,292 @@
+import constant as C
+from bitboard import BitBoard, LINES_THROUGH, mask_positions
+from random import choice, Random
+import numpy as np
+from copy import deepcopy
+
+# positions of the winning lines through each position
+LINE_POSITIONS = tuple(tuple(mask_positions(line) for line in lines) for lines in LINES_THROUGH)
+
+
+class Board:
+    """
+    Board kept as a ROWS x COLUMNS NumPy array of -1 (empty), 0 (X) and 1 (O). Legal moves are found by scanning
+    the array with np.where on every move, so unlike BitBoard, moves take time proportional to the board's cells.
+    """
+
+    def __init__(self, state: []=None, move: int=0, current_player: int=0, child: bool=False):
+        self.move_count = move
+        self.current_player = current_player
+        self.end_game = False
+        self.winning_player = -1
+
+        self.state = np.zeros((C.ROWS, C.COLUMNS), dtype=int)
+        if state is None:
+            self.state.fill(-1)
+
+            # set board if specified
+            if C.RANDOM and not child:
+                self.random_board()
+            elif C.STATIC:
+                self.current_player = self.static_board()
+        else:
+            self.state = state
+
+        self.children = []
+
+    def discover_children(self) -> []:
+        """
+        Generates a child state based on a specifc legal move being added to the parent board
+        :return all of the child states
+        """
+        self.children.clear()
+
+        legal_positions = self.collect_legal_positions()
+        if len(legal_positions) < 1:
+            return
+
+        # every child is reached by the same player, so the parent's current player must not be alternated
+        piece = self.current_player
+        for position in legal_positions:
+            all_positions = []
+            child = Board(deepcopy(self.state), self.move_count, piece, child=True)
+            child.add_piece(piece=piece, position=position)
+            all_positions = deepcopy(legal_positions)
+            all_positions.remove(position)
+            self.children.append((child, piece, position, deepcopy(all_positions)))
+
+        return self.children
+
+    def copy(self) -> 'Board':
+        """
+        :return: an independent copy of the board
+        """
+        return Board(deepcopy(self.state), self.move_count, self.current_player, child=True)
+
+    def get_current_player(self) -> int:
+        """
+        :return returns the current player
+        """
+        return self.current_player
+
+    def winning_state(self, piece: int, position: int) -> (int, int):
+        """
+        Checks if the current board state is a winning state
+        :param piece: the piece that was placed (0 or 1)
+        :param position: the position of the last added piece
+        :return: (1, player's piece (0 or 1)) if player won, (1, 2) if game is still in play
+        """
+        flat_state = self.state.ravel()
+
+        # only the rows, columns and diagonals through the last added piece can have been completed
+        for line in LINE_POSITIONS[position]:
+            if all(flat_state[p] == piece for p in line):
+                self.winning_player = piece
+
+        # check if player won
+        if self.winning_player == piece:
+            self.end_game = True
+            return (1, piece)
+        return 1, 2
+
+    def add_piece(self, piece: int, position: int) -> (int, int):
+        """
+        Adds a piece to the board if the move is legal. If legal position equals -1, there are no more legal moves,
+        if it equals TOTAL_STRATEGIES, a random position can be chosen, if it equals a value between
+        [0, TOTAL_STRATEGIES - 1], the piece can be added to that position.
+        :param piece: piece to add
+        :param position: position in which to add the piece
+        :return tuple (0, -1) if the game was stalemate,
+                tuple (1, player_piece) if won, 'player_piece' indicates the winner
+                tuple (1, 2) if game is continuing
+        """
+        self.current_player = piece
+        legal_position = self.legal_move(position)
+
+        # no legal positions are available
+        if legal_position == -1:
+            return 0, -1
+
+        # add piece to position
+        self.state.ravel()[position] = piece
+        return self.winning_state(piece, position)
+
+    def random_legal_move(self, rng: Random=None) -> int:
+        """
+        Generates a random legal move if there are any remaining
+        :param rng: random generator for the move, the global one by default
+        :return: legal position or -1 if no legal positions remain
+        """
+        # find legal positions
+        positions = np.where(self.state.ravel() < 0)[0]
+
+        if positions.size < 1:
+            return -1
+        if rng is not None:
+            return rng.choice(positions)
+        return choice(positions)
+
+    def collect_legal_positions(self) -> [int]:
+        """
+        If there are any viable legal moves, their positions are returned
+        :return: list of legal positions
+        """
+        coordinates = self.collect_legal_coordinates()
+
+        if coordinates == (-1, -1):
+            return []
+
+        return [int(row * C.COLUMNS + column) for row, column in coordinates]
+
+    def collect_legal_coordinates(self) -> (int, int):
+        """
+        If there are any viable legal moves, their coordinates are returned
+        :return: list of coordinates
+        """
+        legal_moves = np.where(self.state < 0)[0], np.where(self.state < 0)[1]
+
+        # if there are no legal moves remaining, return invalid coordinates
+        if legal_moves[0].size < 1:
+            return -1, -1
+
+        # otherwise, return legal coordinates
+        return list(zip(legal_moves[0], legal_moves[1]))
+
+    def legal_move(self, position: int=-2) -> int:
+        """
+        Check if any legal positions remain on the board, or if the specifically stated position is legal
+        :param position: a specific position or, by default, an invalid position of -2
+        :return: -1 if there are no more legal positions,
+                 position [0, TOTAL_STRATEGIES - 1] if the specific position is legal
+                 TOTAL_STRATEGIES if unspecified legal moves remain
+        """
+        coordinates = self.collect_legal_coordinates()
+
+        # if there are no legal moves remaining
+        if coordinates == (-1, -1):
+            return -1
+
+        # if there are legal moves remaining, but the position wasn't specified
+        if position == -2:
+            return C.TOTAL_STRATEGIES
+
+        # if the position was specified, check if it is a legal move
+        if self.state.ravel()[position] == -1:
+            return position
+        else:
+            return -1
+
+    def alternate_player(self, current_piece: int) -> int:
+        """
+        Alternates to the opposite piece
+        :param current_piece: value of current piece: 0 or 1
+        :return: alternate piece: 1 or 0
+        """
+        if not current_piece:
+            self.current_player = 1
+        else:
+            self.current_player = 0
+        return self.current_player
+
+    def random_board(self) -> int:
+        """
+        Creates a randomly generated, legal board that may be a set number of moves into a game
+        :return the piece of the current player
+        """
+        count = 0
+
+        # if an invalid number of moves is selected, the board is not generated
+        if C.MOVES < 0 or C.MOVES > C.TOTAL_STRATEGIES - 2 or count > C.MOVES:
+            raise ValueError(f'{C.MOVES} in constant.py must be a value between [0,{C.TOTAL_STRATEGIES - 2}] '
+                             f'inclusively')
+
+        # the bitboard engine generates the same distribution of boards without the NumPy overhead
+        if C.BITBOARD:
+            engine = BitBoard(child=True)
+            self.current_player = engine.random_board()
+            self.state = engine.state
+            return self.current_player
+
+        # create the board, one legal move at a time
+        piece = 0
+        while count < C.MOVES and not self.end_game:
+            reset = False
+            count += 1
+
+            # find legal position or reset board if position = -1 (no legal C.MOVES remaining
+            position = self.random_legal_move()
+            if position < 0:
+                reset = True
+
+            if not reset:
+                successful, _ = self.add_piece(piece, position)
+                piece = self.alternate_player(piece)
+
+                # if a winning state was reached or the piece was not successfully placed
+                # reset the game state and continue the while loop to create game state
+                if not successful or self.winning_player != -1:
+                    reset = True
+
+            if reset:
+                count = 0
+                piece = 0
+                self.current_player = 0
+                self.state.fill(-1)
+                self.move_count = 0
+                self.end_game = False
+                self.winning_player = -1
+
+        self.current_player = piece
+
+    def static_board(self) -> int:
+        """
+        Creates a statically set board: [0, -1, 1, -1, 0, -1, -1, -1, 1]
+
+                  X |   | O
+                  ---------
+        Board~>     | X |
+                  ---------
+                    |   | O
+
+        """
+        if C.TOTAL_STRATEGIES != 9:
+            raise ValueError('The static board is only defined for a 3x3 board, set RANDOM in constant.py instead')
+
+        state = [0, -1, 1, -1, 0, -1, -1, -1, 1]
+        state_np = np.asarray(state, dtype=int)
+        self.state = np.reshape(state_np, (C.ROWS, C.COLUMNS))
+        self.current_player = 0
+        return self.current_player
+
+    @staticmethod
+    def piece(value: int) -> str:
+        """
+        Convert integer value of piece into the string equivalent for the game
+         0 ~> 'X'
+         1 ~> 'O'
+        -2 ~> ' '
+        :param value: integer representation of piece
+        :return: string representation of piece
+        """
+        if value < 0:
+            return ' '
+        if value > 0:
+            return 'O'
+        return 'X'
+
+    def display(self):
+        """
+        Displays Tic Tac Toe as a 2-dimensional ROWS x COLUMNS board
+        """
+        line_break = 0
+        for row in self.state:
+            print(' | '.join(self.piece(value) for value in row))
+            if line_break < C.ROWS - 1:
+                print('-' * (4 * C.COLUMNS - 3))
+            line_break += 1
+
+    def display_flat(self):
+        """
+        Displays Tic Tac Toe as a flat list
+        """
+        print(f'board: {self.state.ravel()}')
@@ -0,0 +1,57 @@
+import constant as C
+from bitboard import BitBoard
+from strategy import Strategy
+import random
+import pytest
+
+# boards 0 to 6 moves in, with every board from 3 moves on able to end the game on either of the next two moves
+MOVES = (0, 1, 2, 3, 4, 5, 6)
+
+
+@pytest.fixture
+def settings(monkeypatch):
+    """
+    Restores every constant a test changes
+    """
+    for name in ('SAMPLES', 'SEED', 'MOVES', 'BATCH', 'PARALLEL', 'WORKERS', 'ADAPTIVE', 'EXACT', 'BITBOARD',
+                 'RANDOM', 'STATIC', 'MCTS_PLAYERS', 'MCTS_ITERATIONS', 'MCTS_SECONDS', 'ROUND_SAMPLES', 'PRECISION',
+                 'MAX_SAMPLES'):
+        monkeypatch.setattr(C, name, getattr(C, name))
+    C.SAMPLES = 40
+    C.BITBOARD = True
+    C.EXACT = False
+    return C
+
+
+@pytest.fixture
+def make_boards(settings):
+    def make_boards(count: int, seed: int) -> [BitBoard]:
+        """
+        :param count: number of boards for every number of moves
+        :param seed: seed of the global generator random_board draws its moves from
+        :return: random boards, the same ones for the same seed
+        """
+        random.seed(seed)
+        boards = []
+        for moves in MOVES:
+            C.MOVES = moves
+            for _ in range(count):
+                board = BitBoard(child=True)
+                board.random_board()
+                boards.append(board)
+        return boards
+    return make_boards
+
+
+@pytest.fixture
+def process():
+    def process(board: BitBoard) -> Strategy:
+        """
+        :param board: root board, left unchanged
+        :return: the strategy of the board after sampling its payoff table and comparing its strategies
+        """
+        strategy = Strategy(board.copy())
+        strategy.process()
+        strategy.compare_strategies()
+        return strategy
+    return process
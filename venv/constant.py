@@ -0,0 +1,35 @@
+# game specs
+ROWS = 3                # rows of the board
+COLUMNS = 3             # columns of the board
+IN_A_ROW = 3            # pieces in a horizontal, vertical or diagonal line needed to win
+TOTAL_STRATEGIES = ROWS * COLUMNS   # total possible strategies per player
+BITBOARD = True         # uses the bitboard engine for the game board and rollouts if True, NumPy boards if False
+
+# board initialization options
+STATIC = False          # initializes a static board if True
+RANDOM = True           # initializes a random board if True
+MOVES = 2               # number of moves when initializing the random board [0, TOTAL_STRATEGIES - 2] inclusively or ValueError
+
+# game theory strategy specs
+SAMPLES = 200           # number of samplings per payoff table cell, 0 or more (100,000 to 1,000,000 with BATCH)
+BATCH = False           # samples every payoff table cell in one vectorized NumPy batch if True
+BATCH_ROWS = (1 << 21) // TOTAL_STRATEGIES     # most rollouts held in memory at once by the batched sampler
+SEED = None             # master seed that makes sampling reproducible, fresh randomness if None
+CHUNK_SAMPLES = 10000   # most samples of a payoff table cell drawn from a single random stream
+PARALLEL = False        # samples the payoff table cells on a process pool if True
+WORKERS = None          # processes in the pool, every core if None
+ADAPTIVE = False        # samples each cell in rounds only until its comparisons are settled or precise if True
+ROUND_SAMPLES = 32      # samples added to every unfinished cell per adaptive round
+PRECISION = 0.05        # confidence interval half-width at which an unsettled adaptive cell stops
+CONFIDENCE = 1.96       # z-score of the adaptive confidence intervals (1.96 ~> 95%)
+MAX_SAMPLES = 1000      # most samples an adaptive cell can receive
+EXACT = False           # fills the payoff table from the exact solver instead of sampling if True
+SOLVER_TABLE = 'outcomes.npy'   # solver's transposition table file, created next to solver.py when missing
+
+PROFILE = False         # prints the counters and stage timings of the analysis after the payoff table if True
+NASH_SUPPORT = 9        # most strategies per player in the supports searched for Nash equilibria
+NASH_PAIRS = 1 << 20    # most support pairs enumerated, larger payoff tables are solved as a linear program for one equilibrium
+MCTS_PLAYERS = ()       # pieces (0 for X, 1 for O) that choose their moves with MCTS, the others move at random
+MCTS_ITERATIONS = 2000  # search iterations per MCTS move
+MCTS_SECONDS = None     # search time in seconds per MCTS move, replaces MCTS_ITERATIONS if set
+EXPLORATION = 1.41      # UCT exploration constant (~sqrt(2))
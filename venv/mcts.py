@@ -0,0 +1,227 @@
+import constant as C
+from board import Board
+from bitboard import BitBoard
+from payoff import PayoffTable
+from strategy import Strategy
+from math import log, sqrt
+from random import Random
+from time import perf_counter
+import numpy as np
+
+
+class Node:
+    """
+    Position in the search tree, reached by a piece being added to a position of its parent's board
+    """
+    __slots__ = ('board', 'parent', 'position', 'piece', 'children', 'visits', 'value', 'terminal', 'winner')
+
+    def __init__(self, board: Board or BitBoard, parent: 'Node'=None, position: int=-1, piece: int=-1):
+        """
+        :param board: board after the move, whose current player is the piece that moved
+        :param parent: node of the board before the move, None for the root
+        :param position: where the piece was added
+        :param piece: piece that moved into this node
+        """
+        self.board = board
+        self.parent = parent
+        self.position = position
+        self.piece = piece
+        self.children = None        # position ~> Node once expanded
+        self.visits = 0
+        self.value = 0.0            # total result for piece: 1 per win, 0.5 per stalemate
+
+        # a move that completed a line or filled the board ends the game
+        self.winner = board.winning_player if board.end_game else -1
+        self.terminal = board.end_game or board.legal_move() == -1
+
+
+class MCTS:
+    """
+    Monte Carlo Tree Search with UCT selection. Nodes are expanded with discover_children and evaluated with
+    the random rollouts used for sampling. The tree is kept between moves: advance re-roots it on the move
+    that was played, so the search below that move is reused.
+    """
+
+    def __init__(self, board: Board or BitBoard, to_move: int, rng: Random=None):
+        """
+        :param board: board to search from, left unchanged
+        :param to_move: piece that moves next on the board
+        :param rng: random generator for the rollouts, a fresh unseeded one by default
+        """
+        self.rng = rng if rng is not None else Random()
+        self.root = self.new_root(board, to_move)
+
+    @staticmethod
+    def new_root(board: Board or BitBoard, to_move: int) -> Node:
+        """
+        :param board: board to search from, left unchanged
+        :param to_move: piece of the player to move on the board
+        :return: an unvisited root node over a copy of the board, marked as last moved by the other player
+        """
+        root = board.copy()
+        root.current_player = 1 - to_move
+        return Node(root, piece=1 - to_move)
+
+    def search(self, iterations: int=None, seconds: float=None) -> (int, dict):
+        """
+        Searches from the root until the budget is used up
+        :param iterations: search iterations, C.MCTS_ITERATIONS by default
+        :param seconds: search time, C.MCTS_SECONDS by default. If set, it replaces the iteration budget
+        :return: the most visited move and the statistics of the search
+        """
+        seconds = C.MCTS_SECONDS if seconds is None else seconds
+        iterations = C.MCTS_ITERATIONS if iterations is None else iterations
+        if seconds is not None and seconds <= 0:
+            raise ValueError(f'the search time must be positive, not {seconds}')
+        if seconds is None and iterations < 1:
+            raise ValueError(f'the search needs at least one iteration, not {iterations}')
+        reused = self.root.visits
+
+        # at least one iteration runs even if the time is up, as the first one expands the root
+        start = perf_counter()
+        count = 0
+        if seconds is not None:
+            deadline = start + seconds
+            while count < 1 or perf_counter() < deadline:
+                self.iterate()
+                count += 1
+        else:
+            for count in range(1, iterations + 1):
+                self.iterate()
+        elapsed = perf_counter() - start
+
+        children = self.root.children or {}
+        position = max(children, key=lambda p: children[p].visits) if children else -1
+        stats = {
+            'player': 1 - self.root.piece,
+            'position': position,
+            'iterations': count,
+            'seconds': elapsed,
+            'reused': reused,
+            'visits': {p: child.visits for p, child in children.items()},
+            'values': {p: round(child.value / child.visits, 4) if child.visits else None
+                       for p, child in children.items()},
+        }
+        return position, stats
+
+    def iterate(self):
+        """
+        Runs one iteration: selects a path down the tree, expands its last node, plays a rollout from it and
+        backs the result up the path
+        """
+        node = self.root
+        while node.children:
+            node = self.select(node)
+
+        # nodes are expanded on their second visit, so a rollout from a node comes before its children
+        if not node.terminal and (node.visits > 0 or node is self.root):
+            children = self.expand(node)
+            node = children[self.rng.choice(list(children))]
+
+        self.backpropagate(node, self.simulate(node))
+
+    def select(self, node: Node) -> Node:
+        """
+        :param node: expanded node
+        :return: the first child that was not visited yet, otherwise the child with the highest upper confidence bound
+        """
+        log_visits = log(node.visits)
+        best = None
+        best_score = -1.0
+        for child in node.children.values():
+            if child.visits == 0:
+                return child
+            score = child.value / child.visits + C.EXPLORATION * sqrt(log_visits / child.visits)
+            if score > best_score:
+                best = child
+                best_score = score
+        return best
+
+    @staticmethod
+    def expand(node: Node) -> {int: Node}:
+        """
+        Adds a child for every legal move of the node's board
+        :param node: node that is not terminal
+        :return: the node's children by position
+        """
+        board = node.board
+
+        # discover_children moves the board's current player, which has to be the piece after the node's piece
+        board.current_player = 1 - node.piece
+        children = board.discover_children() or []
+        board.current_player = node.piece
+        board.children = []
+
+        node.children = {position: Node(child, node, position, piece) for child, piece, position, _ in children}
+        return node.children
+
+    def simulate(self, node: Node) -> int:
+        """
+        :param node: node to evaluate
+        :return: the winning piece (0 or 1) of a random rollout from the node, or -1 for a stalemate
+        """
+        if node.terminal:
+            return node.winner
+        if isinstance(node.board, BitBoard):
+            return node.board.rollout(self.rng)
+
+        p1_won, p2_won, _ = Strategy.rollout(node.board.copy(), self.rng)
+        return 0 if p1_won else 1 if p2_won else -1
+
+    @staticmethod
+    def backpropagate(node: Node, winner: int):
+        """
+        Adds the result of a rollout to every node from the node up to the root
+        :param node: node the rollout started from
+        :param winner: the winning piece (0 or 1), or -1 for a stalemate
+        """
+        while node is not None:
+            node.visits += 1
+            node.value += 1.0 if winner == node.piece else 0.5 if winner == -1 else 0.0
+            node = node.parent
+
+    def advance(self, position: int):
+        """
+        Re-roots the tree on a move that was played, keeping the search below it
+        :param position: where the piece that was to move on the root was added
+        """
+        children = self.root.children
+        if children and position in children:
+            self.root = children[position]
+            self.root.parent = None
+        else:
+            board = self.root.board.copy()
+            to_move = 1 - self.root.piece
+            board.add_piece(to_move, position)
+            self.root = Node(board, piece=to_move)
+
+    def seed(self, table: PayoffTable):
+        """
+        Adds the rollouts behind a payoff table of the root to the tree, so the sampling done for the analysis
+        is reused by the search. Every cell counts as many visits as its payoff adds up to, including cells whose
+        first or second move ended the game, so a move that wins at once starts with as many visits as the others
+        and with its true value.
+        :param table: payoff table of the root's next two moves
+        """
+        if self.root.terminal or not table.mask.any():
+            return
+
+        children = self.root.children or self.expand(self.root)
+        for p1_position, p2_position in np.argwhere(table.mask):
+            child = children.get(int(p1_position))
+            if child is None:
+                continue
+
+            # a first move that ended the game has no replies, so its cells only add to the child and the root
+            nodes = (child, self.root)
+            if not child.terminal:
+                grandchild = (child.children or self.expand(child)).get(int(p2_position))
+                if grandchild is None:
+                    continue
+                nodes = (grandchild,) + nodes
+
+            x_won, o_won, stalemates = table.payoffs[p1_position, p2_position].tolist()
+            visits = round(x_won + o_won + stalemates)
+            for node in nodes:
+                node.visits += visits
+                node.value += (x_won if node.piece == 0 else o_won) + stalemates / 2
@@ -0,0 +1,217 @@
+import constant as C
+from payoff import PayoffTable
+from itertools import combinations
+import numpy as np
+
+# tolerance of the indifference and best response checks
+TOLERANCE = 1e-9
+
+# most support pairs solved at once, which bounds the memory of the batched linear systems
+PAIRS = 1 << 15
+
+
+class Nash:
+    """
+    Finds the pure and mixed Nash equilibria of a payoff table by support enumeration. Strictly dominated
+    strategies are removed first, as no equilibrium plays them. Then for every pair of equally sized supports,
+    the mixed strategy of each player that makes the other player indifferent over its support is found by solving
+    all of the pairs' linear systems at once, and kept if neither player can do better outside of its support.
+    As the game is zero-sum, this finds every extreme equilibrium. The number of support pairs grows exponentially
+    with the positions, so larger tables are solved instead as the maximin linear program, which finds one
+    equilibrium.
+    """
+
+    def __init__(self, table: PayoffTable, max_support: int=None, max_pairs: int=None):
+        """
+        :param table: payoff table of the next two moves
+        :param max_support: most strategies in a player's support, C.NASH_SUPPORT by default
+        :param max_pairs: most support pairs enumerated before the linear program is used, C.NASH_PAIRS by default
+        """
+        self.table = table
+        self.positions = np.array(table.legal_positions, dtype=np.intp)
+        self.first, self.second = table.matrices()
+        self.max_support = C.NASH_SUPPORT if max_support is None else max_support
+        self.max_pairs = C.NASH_PAIRS if max_pairs is None else max_pairs
+
+    def pure_equilibria(self) -> [(int, int)]:
+        """
+        :return: (first player's position, second player's position) of every strategy pair where both
+                 positions are best responses to each other
+        """
+        if self.positions.size < 1 or not np.isfinite(self.first).all():
+            return []
+        best = (self.first >= self.first.max(axis=0, keepdims=True) - TOLERANCE) & \
+               (self.second >= self.second.max(axis=1, keepdims=True) - TOLERANCE)
+        return [(int(self.positions[row]), int(self.positions[column])) for row, column in np.argwhere(best)]
+
+    def equilibria(self) -> [(np.ndarray, np.ndarray, float, float)]:
+        """
+        :return: (first player's mixed strategy, second player's mixed strategy, first player's value,
+                 second player's value) of every equilibrium found, smallest supports first. Each mixed strategy
+                 is the probability of playing each position, of shape (TOTAL_STRATEGIES,). Only the maximin
+                 equilibrium is returned if there are more than max_pairs support pairs or none of them is one.
+        """
+        if self.positions.size < 1 or not np.isfinite(self.first).all():
+            return []
+
+        # the supports are enumerated over the strategies that survive the elimination
+        kept_rows, kept_columns = self.undominated()
+        first, second = self.first[np.ix_(kept_rows, kept_columns)], self.second[np.ix_(kept_rows, kept_columns)]
+        supports = range(1, min(self.max_support, len(kept_rows), len(kept_columns)) + 1)
+        if sum(self.count(len(kept_rows), support) * self.count(len(kept_columns), support) for support in supports) \
+                > self.max_pairs:
+            return [self.maximin()]
+
+        found = {}
+        for support in supports:
+            row_supports = np.array(list(combinations(range(len(kept_rows)), support)), dtype=np.intp)
+            column_supports = np.array(list(combinations(range(len(kept_columns)), support)), dtype=np.intp)
+            for start in range(0, len(row_supports) * len(column_supports), PAIRS):
+                pairs = np.arange(start, min(start + PAIRS, len(row_supports) * len(column_supports)))
+                rows = row_supports[pairs // len(column_supports)]
+                columns = column_supports[pairs % len(column_supports)]
+                for x, y, u, v in zip(*self.solve(first, second, rows, columns)):
+                    x, y = self.clean(x), self.clean(y)
+                    found.setdefault((np.round(x, 9).tobytes(), np.round(y, 9).tobytes()), (x, y, u, v))
+
+        equilibria = []
+        for x, y, u, v in found.values():
+            first_mix, second_mix = np.zeros(C.TOTAL_STRATEGIES), np.zeros(C.TOTAL_STRATEGIES)
+            first_mix[self.positions[kept_rows]], second_mix[self.positions[kept_columns]] = x, y
+            equilibria.append((first_mix, second_mix, float(u), float(v)))
+        return equilibria or [self.maximin()]
+
+    def maximin(self) -> (np.ndarray, np.ndarray, float, float):
+        """
+        Solves the zero-sum game as a linear program with the simplex method. The payoffs are shifted to be
+        positive, so the second player's program, maximize sum(q) subject to payoffs @ q <= 1 and q >= 0, starts
+        from a feasible basis of slack variables, and the first player's strategy is read from the dual values of
+        the slacks. Bland's rule picks the pivots, as ties are common in payoff tables.
+        :return: the first player's and the second player's mixed strategies and values of an equilibrium, as in
+                 equilibria
+        """
+        shift = 1 - self.first.min()
+        rows, columns = self.first.shape
+        tableau = np.zeros((rows + 1, columns + rows + 1))
+        tableau[:rows, :columns] = self.first + shift
+        tableau[:rows, columns:-1] = np.eye(rows)
+        tableau[:rows, -1] = 1
+        tableau[rows, :columns] = -1
+        basis = np.arange(columns, columns + rows)
+
+        while True:
+            entering = np.flatnonzero(tableau[rows, :-1] < -TOLERANCE)
+            if entering.size < 1:
+                break
+            entering = entering[0]
+
+            # every payoff is positive, so the program is bounded and some row can always leave
+            column = tableau[:rows, entering]
+            ratios = np.full(rows, np.inf)
+            np.divide(tableau[:rows, -1], column, out=ratios, where=column > TOLERANCE)
+            ties = np.flatnonzero(ratios <= ratios.min() + TOLERANCE)
+            leaving = ties[np.argmin(basis[ties])]
+
+            tableau[leaving] /= tableau[leaving, entering]
+            factors = tableau[:, entering].copy()
+            factors[leaving] = 0
+            tableau -= np.outer(factors, tableau[leaving])
+            basis[leaving] = entering
+
+        total = tableau[rows, -1]
+        second = np.zeros(columns)
+        second[basis[basis < columns]] = tableau[:rows, -1][basis < columns]
+        first = np.clip(tableau[rows, columns:-1], 0, None)
+
+        first_mix, second_mix = np.zeros(C.TOTAL_STRATEGIES), np.zeros(C.TOTAL_STRATEGIES)
+        first_mix[self.positions], second_mix[self.positions] = self.clean(first), self.clean(second)
+        value = 1 / total - shift
+        return first_mix, second_mix, float(value), float(-value)
+
+    @staticmethod
+    def clean(mix: np.ndarray) -> np.ndarray:
+        """
+        :param mix: weights of a mixed strategy
+        :return: the mixed strategy without the rounding leftovers of the linear solves, summing to 1
+        """
+        mix = np.where(mix > TOLERANCE, mix, 0)
+        return mix / mix.sum()
+
+    @staticmethod
+    def count(items: int, size: int) -> int:
+        """
+        :param items: number of strategies
+        :param size: number of strategies in a support
+        :return: number of supports of the size, exactly
+        """
+        count = 1
+        for taken in range(size):
+            count = count * (items - taken) // (taken + 1)
+        return count
+
+    def undominated(self) -> (np.ndarray, np.ndarray):
+        """
+        Removes strictly dominated strategies of both players until none are left
+        :return: indices into the legal positions of the first player's and the second player's remaining strategies
+        """
+        rows = np.arange(self.positions.size)
+        columns = np.arange(self.positions.size)
+        while True:
+            first, second = self.first[np.ix_(rows, columns)], self.second[np.ix_(rows, columns)]
+            dominated_rows = (first[None, :, :] > first[:, None, :]).all(axis=2).any(axis=1)
+            dominated_columns = (second.T[None, :, :] > second.T[:, None, :]).all(axis=2).any(axis=1)
+            if not dominated_rows.any() and not dominated_columns.any():
+                return rows, columns
+            rows, columns = rows[~dominated_rows], columns[~dominated_columns]
+
+    @staticmethod
+    def solve(first: np.ndarray, second: np.ndarray, rows: np.ndarray, columns: np.ndarray) \
+            -> (np.ndarray, np.ndarray, np.ndarray, np.ndarray):
+        """
+        Solves the indifference conditions of many support pairs at once
+        :param first: first player's payoff matrix
+        :param second: second player's payoff matrix
+        :param rows: first player's supports, of shape (pairs, support size)
+        :param columns: second player's supports, of shape (pairs, support size)
+        :return: mixed strategies of both players and their values, for each pair whose strategies are an
+                 equilibrium
+        """
+        # the first player's strategy must be valid and leave the second player nothing better than its support,
+        # and only the pairs where it is need the second player's strategy
+        x, v, valid = Nash.indifference(second.T, columns, rows)
+        valid &= (x @ second).max(axis=1) <= v + TOLERANCE
+        x, v, rows, columns = x[valid], v[valid], rows[valid], columns[valid]
+
+        y, u, valid = Nash.indifference(first, rows, columns)
+        valid &= (first @ y.T).max(axis=0) <= u + TOLERANCE
+        return x[valid], y[valid], u[valid], v[valid]
+
+    @staticmethod
+    def indifference(payoffs: np.ndarray, indifferent: np.ndarray, mixed: np.ndarray) \
+            -> (np.ndarray, np.ndarray, np.ndarray):
+        """
+        Finds the mixed strategy over one player's support that gives the other player the same payoff for
+        every strategy in its own support
+        :param payoffs: payoffs of the indifferent player, with its strategies as rows
+        :param indifferent: supports of the indifferent player, of shape (pairs, support size)
+        :param mixed: supports of the mixing player, of shape (pairs, support size)
+        :return: mixed strategies over every strategy, the indifferent player's payoff and whether each
+                 pair has a unique, non-negative solution
+        """
+        pairs, support = mixed.shape
+        systems = np.zeros((pairs, support + 1, support + 1))
+        systems[:, :support, :support] = payoffs[indifferent[:, :, None], mixed[:, None, :]]
+        systems[:, :support, support] = -1
+        systems[:, support, :support] = 1
+        targets = np.zeros((pairs, support + 1))
+        targets[:, support] = 1
+
+        # singular systems have no unique solution, so they are replaced by the identity and discarded
+        valid = np.abs(np.linalg.det(systems)) > TOLERANCE
+        systems[~valid] = np.eye(support + 1)
+        solutions = np.linalg.solve(systems, targets[..., None])[..., 0]
+
+        probabilities = np.zeros((pairs, payoffs.shape[1]))
+        np.put_along_axis(probabilities, mixed, solutions[:, :support], axis=1)
+        valid &= (solutions[:, :support] >= -TOLERANCE).all(axis=1)
+        return np.clip(probabilities, 0, 1), solutions[:, support], valid
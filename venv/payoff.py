@@ -0,0 +1,151 @@
+import constant as C
+import numpy as np
+
+
+class PayoffTable:
+    """
+    Payoff table of the next two moves kept as NumPy arrays indexed by (first player's position, second player's
+    position). Strategy pairs that are not in the table, such as the same position twice or positions that were
+    already taken, are masked out.
+    """
+
+    def __init__(self, first_player: int=-1, second_player: int=-1, legal_positions: [int]=()):
+        """
+        :param first_player: piece of the player choosing a row
+        :param second_player: piece of the player choosing a column
+        :param legal_positions: positions that were open on the root board
+        """
+        self.first_player = first_player
+        self.second_player = second_player
+        self.legal_positions = sorted(legal_positions)
+        self.payoffs = np.full((C.TOTAL_STRATEGIES, C.TOTAL_STRATEGIES, 3), np.nan)   # (X won, O won, stalemate)
+        self.samples = np.zeros((C.TOTAL_STRATEGIES, C.TOTAL_STRATEGIES), dtype=np.int64)
+        self.errors = np.full((C.TOTAL_STRATEGIES, C.TOTAL_STRATEGIES, 3), np.nan)
+        self.mask = np.zeros((C.TOTAL_STRATEGIES, C.TOTAL_STRATEGIES), dtype=bool)
+        self.solved = np.zeros((C.TOTAL_STRATEGIES, C.TOTAL_STRATEGIES), dtype=bool)  # cells from the exact solver
+        self.decided = np.zeros(C.TOTAL_STRATEGIES, dtype=bool)   # rows where the first move ended the game
+
+    def set(self, p1_position: int, p2_position: int, payoff: (float, float, float), samples: int=0,
+            error: (float, float, float)=None, solved: bool=False):
+        """
+        Fills the cell of a strategy pair
+        :param p1_position: first player's position
+        :param p2_position: second player's position
+        :param payoff: payoff values (X won, O won, stalemate)
+        :param samples: number of samples behind the payoff, 0 if it was not sampled
+        :param error: confidence interval half-widths of the payoff proportions, if sampled
+        :param solved: True if the payoff came from the exact solver
+        """
+        self.payoffs[p1_position, p2_position] = payoff
+        self.samples[p1_position, p2_position] = samples
+        if error is not None:
+            self.errors[p1_position, p2_position] = error
+        self.mask[p1_position, p2_position] = True
+        self.solved[p1_position, p2_position] = solved
+
+    def decide(self, p1_position: int, payoff: (float, float, float)):
+        """
+        Fills the row of a first move that ended the game, which has the same payoff for every reply
+        :param p1_position: first player's position
+        :param payoff: payoff values (X won, O won, stalemate)
+        """
+        columns = [position for position in self.legal_positions if position != p1_position]
+        self.payoffs[p1_position, columns] = payoff
+        self.mask[p1_position, columns] = True
+        self.decided[p1_position] = True
+
+    def payoff(self, p1_position: int, p2_position: int) -> (float, float, float) or None:
+        """
+        :param p1_position: first player's position
+        :param p2_position: second player's position
+        :return: payoff values of the strategy pair, as counts unless they came from the exact solver,
+                 None if it is masked out
+        """
+        return self.row(p1_position)[p2_position]
+
+    def row(self, p1_position: int) -> [(float, float, float) or None]:
+        """
+        :param p1_position: first player's position
+        :return: payoff values of every strategy pair in the row, as in payoff
+        """
+        return [None if not present else tuple(payoff) if solved else tuple(int(value) for value in payoff)
+                for payoff, present, solved in zip(self.payoffs[p1_position].tolist(), self.mask[p1_position].tolist(),
+                                                   self.solved[p1_position].tolist())]
+
+    def dominance(self) -> (np.ndarray, np.ndarray):
+        """
+        Decides for every position if it is a dominant strategy (1), not dominant (0) or undecided (-1).
+        A first player's strategy is not dominant if any of its cells has the second player winning more often or
+        stalemates at least as often as the first player winning, and is dominant if otherwise any cell has the
+        first player winning more often. The second player's strategies follow the same rules as
+        Strategy.compare_strategies has always applied to them.
+        :return: the first player's and the second player's strategies
+        """
+        p1, p2, stalemate = np.moveaxis(self.payoffs, 2, 0)
+        decided = self.mask & self.decided[:, None]
+        played = self.mask & ~self.decided[:, None]
+
+        with np.errstate(invalid='ignore'):
+            p2_better = played & (p2 > p1)
+            p1_not_better = self.mask & (stalemate >= p1)
+            p1_better = self.mask & ~p1_not_better & (p1 > p2)
+            p2_not_better = played & ((stalemate >= p2) | p1_better)
+
+        player1_strategies = np.full(C.TOTAL_STRATEGIES, -1, dtype=int)
+        player1_strategies[p1_better.any(axis=1)] = 1
+        player1_strategies[(p2_better | p1_not_better).any(axis=1)] = 0
+
+        # a row where the first move ended the game leaves the second player without any dominant strategy
+        player2_strategies = np.full(C.TOTAL_STRATEGIES, -1, dtype=int)
+        player2_strategies[p2_better.any(axis=1)] = 1
+        player2_strategies[p2_not_better.any(axis=0)] = 0
+        if decided.any():
+            player2_strategies[self.legal_positions] = 0
+
+        return player1_strategies, player2_strategies
+
+    def matrices(self) -> (np.ndarray, np.ndarray):
+        """
+        Builds the normal-form game between the two players over the legal positions, where each player's payoff
+        is its share of wins minus its share of losses. A reply on the position the first player just took is
+        replaced by a uniformly random legal reply, so it gets the average of the row's payoffs.
+        :return: the first player's and the second player's payoff matrices, of shape (positions, positions)
+        """
+        positions = self.legal_positions
+        payoffs = self.payoffs[np.ix_(positions, positions)]
+        mask = self.mask[np.ix_(positions, positions)]
+
+        with np.errstate(invalid='ignore', divide='ignore'):
+            first = (payoffs[..., self.first_player] - payoffs[..., self.second_player]) / payoffs.sum(axis=2)
+            first = np.where(mask, first, 0)
+            average = first.sum(axis=1, keepdims=True) / mask.sum(axis=1, keepdims=True)
+        first = np.where(mask, first, average)
+        return first, -first
+
+    def arrays(self) -> dict:
+        """
+        :return: every array of the table along with the players and legal positions, e.g. for np.savez
+        """
+        return {'players': np.array([self.first_player, self.second_player], dtype=np.int8),
+                'legal_positions': np.array(self.legal_positions, dtype=np.int16),
+                'payoffs': self.payoffs, 'samples': self.samples, 'errors': self.errors, 'mask': self.mask,
+                'solved': self.solved, 'decided': self.decided}
+
+    def save(self, path: str):
+        """
+        Writes the table to a compressed .npz file
+        :param path: location of the file
+        """
+        np.savez_compressed(path, **self.arrays())
+
+    @classmethod
+    def load(cls, path: str) -> 'PayoffTable':
+        """
+        :param path: location of a file written by save
+        :return: the table
+        """
+        with np.load(path) as arrays:
+            table = cls(*(int(player) for player in arrays['players']), arrays['legal_positions'].tolist())
+            for name in ('payoffs', 'samples', 'errors', 'mask', 'solved', 'decided'):
+                setattr(table, name, arrays[name])
+        return table
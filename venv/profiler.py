@@ -0,0 +1,106 @@
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+from functools import wraps
+from time import perf_counter
+import numpy as np
+
+
+class Profiler:
+    """
+    Collects counters (rollouts run, plies simulated, board copies made, ...) and the time spent in each stage
+    of the pipeline. Code only reports to a profiler that was passed to it, so nothing is measured otherwise.
+    """
+
+    def __init__(self):
+        """
+        Starts with no counters and no timed stages
+        """
+        self.counters = Counter()
+        self.timings = defaultdict(list)    # stage ~> seconds of every timed call
+
+    def count(self, name: str, amount: int=1):
+        """
+        :param name: counter to increase
+        :param amount: how much to increase it by
+        """
+        self.counters[name] += int(amount)
+
+    @contextmanager
+    def time(self, stage: str):
+        """
+        Times the code run inside the with block as one call of the stage
+        :param stage: name of the stage
+        """
+        start = perf_counter()
+        try:
+            yield
+        finally:
+            self.timings[stage].append(perf_counter() - start)
+
+    def merge(self, other: 'Profiler'):
+        """
+        Adds the counters and timings of another profiler, e.g. one returned by a worker process
+        :param other: profiler to add, ignored if None
+        """
+        if other is None:
+            return
+        self.counters.update(other.counters)
+        for stage, seconds in other.timings.items():
+            self.timings[stage].extend(seconds)
+
+    def reset(self):
+        """
+        Clears every counter and timing
+        """
+        self.counters.clear()
+        self.timings.clear()
+
+    @staticmethod
+    def latency(seconds: [float]) -> dict:
+        """
+        :param seconds: durations of every call
+        :return: number of calls, total, mean and percentiles of the durations in seconds
+        """
+        seconds = np.asarray(seconds, dtype=float)
+        p50, p90, p99 = np.percentile(seconds, (50, 90, 99))
+        return {'calls': int(seconds.size), 'total': float(seconds.sum()), 'mean': float(seconds.mean()),
+                'min': float(seconds.min()), 'p50': float(p50), 'p90': float(p90), 'p99': float(p99),
+                'max': float(seconds.max())}
+
+    def summary(self) -> dict:
+        """
+        :return: JSON-serializable counters and the latency of each stage
+        """
+        return {'counters': dict(self.counters),
+                'stages': {stage: self.latency(seconds) for stage, seconds in self.timings.items() if seconds}}
+
+    def display(self):
+        """
+        Prints the counters and the time spent in each stage
+        """
+        summary = self.summary()
+        print('\nPROFILE:')
+        for name, value in sorted(summary['counters'].items()):
+            print(f'{name:>24}: {value}')
+        for stage, latency in summary['stages'].items():
+            print(f'{stage:>24}: {latency["total"] * 1000:.2f} ms over {latency["calls"]} call(s), '
+                  f'p50 {latency["p50"] * 1000:.3f} ms, p99 {latency["p99"] * 1000:.3f} ms')
+
+
+def timed(method):
+    """
+    Times every call of a method as a stage named after it, whenever the object it belongs to has a profiler
+    :param method: method of an object with a profiler attribute
+    :return: the wrapped method
+    """
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        """
+        Calls the method, timing it if the object has a profiler
+        :return: what the method returns
+        """
+        if self.profiler is None:
+            return method(self, *args, **kwargs)
+        with self.profiler.time(method.__name__):
+            return method(self, *args, **kwargs)
+    return wrapper
@@ -0,0 +1,166 @@
+import constant as C
+from bitboard import CELLS, LINES_THROUGH, WIN_MASKS
+import numpy as np
+
+
+def find_line_ids() -> np.ndarray:
+    """
+    Lists the index in WIN_MASKS of every winning line through each board position. Positions with fewer lines
+    repeat their first line, which fancy-indexed updates and the any() over lines both ignore.
+    :return: array of shape (CELLS, most lines through a position)
+    """
+    most_lines = max(len(lines) for lines in LINES_THROUGH)
+    line_ids = np.zeros((CELLS, most_lines), dtype=np.intp)
+    for position, lines in enumerate(LINES_THROUGH):
+        ids = [WIN_MASKS.index(line) for line in lines]
+        line_ids[position] = [ids[min(i, len(ids) - 1)] for i in range(most_lines)]
+    return line_ids
+
+
+LINE_IDS = find_line_ids()
+
+# INCIDENCE[position, line] is 1 if the winning line goes through the position
+INCIDENCE = np.array([[line >> position & 1 for line in WIN_MASKS] for position in range(CELLS)],
+                     dtype=np.float32).reshape((CELLS, len(WIN_MASKS)))
+
+
+class BatchSampler:
+    """
+    Plays many random rollouts at once as rows of a (rollouts, CELLS) NumPy array, so every ply
+    selects, places and checks the pieces of the whole batch together
+    """
+
+    def __init__(self, samples: int=None, rng: np.random.Generator=None, profiler=None):
+        """
+        :param samples: number of rollouts per board, C.SAMPLES by default
+        :param rng: random generator used for move selection, a fresh unseeded one by default
+        :param profiler: Profiler that counts the rollouts run and plies played, if any
+        """
+        samples = C.SAMPLES if samples is None else samples
+        if samples < 0:
+            raise ValueError(f'SAMPLES constant in constant.py must be 0 or more, not {samples}.')
+
+        self.samples = samples
+        self.rng = rng if rng is not None else np.random.default_rng()
+        self.profiler = profiler
+
+    def sample(self, board) -> (int, int, int):
+        """
+        Samples a single board
+        :param board: Board or BitBoard that is still in play
+        :return: payoff values (X won, O won, stalemate) for the board
+        """
+        return self.sample_cells([board])[0]
+
+    def sample_cells(self, boards: [], counts: [int]=None, rngs: [np.random.Generator]=None) -> [(int, int, int)]:
+        """
+        Samples every board in a single batch, e.g. every open cell of a payoff table
+        :param boards: Boards or BitBoards that are still in play, the next move belonging to the
+                       opposite of each board's current player
+        :param counts: number of rollouts per board, self.samples for every board by default
+        :param rngs: one random generator per board, used instead of self.rng. Each board then only draws from
+                     its own generator, so its payoff does not depend on the other boards in the batch
+        :return: payoff values (X won, O won, stalemate) for each board, in order
+        """
+        if len(boards) < 1:
+            return []
+
+        starts = np.stack([np.asarray(board.state, dtype=np.int8).ravel() for board in boards])
+        movers = np.array([1 - board.get_current_player() for board in boards], dtype=np.int8)
+        counts = np.full(len(boards), self.samples) if counts is None else counts
+        totals = np.zeros((len(boards), 3), dtype=np.int64)
+
+        # rollouts are flattened to one row per (board, sample) and run in chunks to bound memory
+        for cells in self.chunks(counts):
+            winners = self.rollouts(starts[cells], movers[cells], cells, rngs)
+            totals += np.bincount(cells * 3 + winners, minlength=totals.size).reshape(totals.shape)
+
+        return [tuple(int(total) for total in payoff) for payoff in totals]
+
+    @staticmethod
+    def chunks(counts: [int]) -> np.ndarray:
+        """
+        Groups the rollouts of whole boards into chunks of at most C.BATCH_ROWS rows. A board is only split when
+        it has more rollouts than fit in a chunk, and then always at multiples of C.BATCH_ROWS of its own rollouts.
+        :param counts: number of rollouts per board
+        :return: yields the board index of every row in the next chunk
+        """
+        owners = []
+        size = 0
+        for board, count in enumerate(counts):
+            while count > 0:
+                rows = min(count, C.BATCH_ROWS)
+                if size + rows > C.BATCH_ROWS:
+                    yield np.concatenate(owners)
+                    owners = []
+                    size = 0
+                owners.append(np.full(rows, board, dtype=np.intp))
+                size += rows
+                count -= rows
+
+        if owners:
+            yield np.concatenate(owners)
+
+    def rollouts(self, states: np.ndarray, players: np.ndarray, owners: np.ndarray=None,
+                 rngs: [np.random.Generator]=None) -> np.ndarray:
+        """
+        Plays random moves on every state until each one reaches an end state
+        :param states: array of shape (rollouts, CELLS) with -1 for empty, 0 for X and 1 for O
+        :param players: the piece to move next for each state
+        :param owners: ascending index of the board each state was sampled from, required with rngs
+        :param rngs: random generator per board, self.rng for every state if None
+        :return: outcome index per state: 0 if X won, 1 if O won, 2 for stalemate
+        """
+        outcomes = np.full(len(states), 2, dtype=np.intp)
+        if self.profiler is not None:
+            self.profiler.count('rollouts', len(states))
+
+        # a random playout fills the empty positions in a uniformly random order, so each state's order is drawn
+        # once by sorting random keys, with the occupied positions given keys that sort them to the end
+        if rngs is None:
+            keys = self.rng.random(states.shape)
+        else:
+            boards, sizes = np.unique(owners, return_counts=True)
+            keys = np.concatenate([rngs[b].random((size, states.shape[1])) for b, size in zip(boards, sizes)])
+        keys[states >= 0] = 2
+        empties = (states < 0).sum(axis=1)
+
+        # index maps the rows still being played back to their outcome. Rows that finish stay in the arrays,
+        # marked as not alive, until half of them have finished and the arrays are compacted
+        index = np.flatnonzero(empties)
+        pieces = players[index]
+        order = keys[index].argsort(axis=1).T.astype(np.int16 if CELLS < 1 << 15 else np.intp)
+        empties = empties[index]
+        alive = np.ones(index.size, dtype=bool)
+
+        # counts[piece, row, line] is the number of the piece's pieces in the line, a line is won at IN_A_ROW
+        counts = np.stack([(states[index] == piece) @ INCIDENCE for piece in (0, 1)]).astype(np.int8)
+
+        ply = 0
+        while index.size:
+            if self.profiler is not None:
+                self.profiler.count('plies', np.count_nonzero(alive))
+
+            # flat indices into counts of the lines through each placed piece
+            lines = LINE_IDS[order[ply]] + ((pieces * index.size + np.arange(index.size)) * counts.shape[2])[:, None]
+            flat = counts.reshape(-1)
+            flat[lines] += 1
+
+            # only the lines through the placed pieces can have been completed
+            won = (flat[lines] == C.IN_A_ROW).any(axis=1) & alive
+            outcomes[index[won]] = pieces[won]
+
+            # states without a winner or any empty position left end in stalemate
+            ply += 1
+            alive &= ~won & (empties > ply)
+            pieces = 1 - pieces
+
+            if 2 * np.count_nonzero(alive) <= index.size:
+                index = index[alive]
+                order = order[:, alive]
+                counts = np.ascontiguousarray(counts[:, alive])
+                empties = empties[alive]
+                pieces = pieces[alive]
+                alive = alive[alive]
+
+        return outcomes
@@ -0,0 +1,170 @@
+import constant as C
+from bitboard import WIN_MASKS, mask_positions
+import numpy as np
+import os
+
+CELLS = C.ROWS * C.COLUMNS
+
+# record layout of the transposition table file, one record per canonical position
+RECORD = np.dtype([('key', '<u4'), ('outcomes', '<f8', (3,)), ('value', 'i1')])
+
+
+def find_symmetries() -> np.ndarray:
+    """
+    Builds the base-3 place values of every rotation and reflection of the board, so that the encoding
+    of each symmetric board is a single dot product
+    :return: array of shape (CELLS, 8) where column s holds the place value of each position under symmetry s
+    """
+    grid = np.arange(CELLS).reshape((C.ROWS, C.COLUMNS))
+    permutations = [np.rot90(grid, k).ravel() for k in range(4)] + \
+                   [np.rot90(np.fliplr(grid), k).ravel() for k in range(4)]
+
+    place_values = np.zeros((CELLS, len(permutations)), dtype=np.int64)
+    for s, permutation in enumerate(permutations):
+        place_values[permutation, s] = 3 ** np.arange(CELLS)
+    return place_values
+
+
+SYMMETRIES = find_symmetries() if (C.ROWS, C.COLUMNS, C.IN_A_ROW) == (3, 3, 3) else None
+WIN_LINES = [mask_positions(mask) for mask in WIN_MASKS]
+
+# solvers loaded by Solver.shared, by the path of their table file
+SOLVERS = {}
+
+
+class Solver:
+    """
+    Exact outcome distributions under uniformly random play and minimax values under optimal play for every
+    legal position, where X always moves first. Positions are stored once per symmetry class in a
+    transposition table that is saved to disk and memory-mapped when loaded.
+    """
+
+    def __init__(self, path: str=None):
+        """
+        Loads the transposition table, solving and saving it first if the file does not exist yet
+        :param path: location of the table file, C.SOLVER_TABLE next to this module by default
+        """
+        if SYMMETRIES is None:
+            raise ValueError(f'The exact solver only supports a 3x3 board with 3 in a row, not '
+                             f'{C.ROWS}x{C.COLUMNS} with {C.IN_A_ROW} in a row')
+
+        self.path = path if path is not None else os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                                               C.SOLVER_TABLE)
+        if not os.path.exists(self.path):
+            self.save(self.solve(), self.path)
+
+        table = np.load(self.path, mmap_mode='r')
+        self.keys = table['key']
+        self.outcome_table = table['outcomes']
+        self.value_table = table['value']
+
+    @classmethod
+    def shared(cls, path: str=None) -> 'Solver':
+        """
+        Loads each table file once per process, so every Strategy reuses the same memory-mapped table
+        :param path: location of the table file, C.SOLVER_TABLE next to this module by default
+        :return: the solver of the table file
+        """
+        path = path if path is not None else os.path.join(os.path.dirname(os.path.abspath(__file__)), C.SOLVER_TABLE)
+        if path not in SOLVERS:
+            SOLVERS[path] = cls(path)
+        return SOLVERS[path]
+
+    @staticmethod
+    def canonical(state: [int]) -> int:
+        """
+        Encodes a board in base 3 (empty 0, X 1, O 2) under every symmetry and keeps the smallest encoding
+        :param state: 2-dimensional or flat board state where -1 is empty, 0 is X and 1 is O
+        :return: encoding shared by all rotations and reflections of the board
+        """
+        return int(((np.asarray(state).ravel() + 1) @ SYMMETRIES).min())
+
+    def lookup(self, state: [int]) -> int:
+        """
+        :param state: board state to find
+        :return: index of the board's record in the table
+        """
+        key = self.canonical(state)
+        index = int(np.searchsorted(self.keys, key))
+        if index == len(self.keys) or self.keys[index] != key:
+            raise ValueError(f'{np.asarray(state).ravel()} is not a legal board state')
+        return index
+
+    def outcomes(self, board) -> (float, float, float):
+        """
+        :param board: Board or BitBoard
+        :return: probabilities of (X won, O won, stalemate) when both players move uniformly at random
+        """
+        return tuple(float(p) for p in self.outcome_table[self.lookup(board.state)])
+
+    def minimax(self, board) -> int:
+        """
+        :param board: Board or BitBoard
+        :return: game value under optimal play: 1 if X wins, -1 if O wins, 0 for stalemate
+        """
+        return int(self.value_table[self.lookup(board.state)])
+
+    def payoff(self, board) -> (float, float, float):
+        """
+        Scales the exact outcome probabilities to the payoff a perfect C.SAMPLES-sample run would produce
+        :param board: Board or BitBoard
+        :return: expected payoff values (X won, O won, stalemate)
+        """
+        return tuple(round(p * C.SAMPLES, 2) for p in self.outcomes(board))
+
+    @staticmethod
+    def solve() -> np.ndarray:
+        """
+        Evaluates every legal position reachable from the empty board
+        :return: records sorted by canonical key
+        """
+        table = {}
+
+        def evaluate(state: [int], player: int) -> ((float, float, float), int):
+            """
+            Solves a board and every board reachable from it, storing each result under its canonical key
+            :param state: flat board state, restored before returning
+            :param player: piece of the player to move
+            :return: (X won, O won, stalemate) probabilities under uniformly random play, and the minimax value
+            """
+            key = Solver.canonical(state)
+            if key in table:
+                return table[key]
+
+            # the previous player may have just completed a line
+            previous = 1 - player
+            if any(all(state[position] == previous for position in line) for line in WIN_LINES):
+                result = (tuple(float(previous == piece) for piece in (0, 1)) + (0.0,), 1 - 2 * previous)
+            elif -1 not in state:
+                result = ((0.0, 0.0, 1.0), 0)
+            else:
+                totals = np.zeros(3)
+                values = []
+                empty = [position for position in range(CELLS) if state[position] < 0]
+                for position in empty:
+                    state[position] = player
+                    outcomes, value = evaluate(state, 1 - player)
+                    state[position] = -1
+                    totals += outcomes
+                    values.append(value)
+                result = (tuple(totals / len(empty)), max(values) if player == 0 else min(values))
+
+            table[key] = result
+            return result
+
+        evaluate([-1] * CELLS, 0)
+
+        records = np.zeros(len(table), dtype=RECORD)
+        for i, key in enumerate(sorted(table)):
+            records[i] = (key, table[key][0], table[key][1])
+        return records
+
+    @staticmethod
+    def save(records: np.ndarray, path: str):
+        """
+        Writes the transposition table to disk
+        :param records: solved records
+        :param path: location of the table file
+        """
+        with open(path, 'wb') as file:
+            np.save(file, records)
@@ -0,0 +1,554 @@
+import constant as C
+from board import Board
+from bitboard import BitBoard
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import nullcontext
+from copy import deepcopy
+from random import Random
+from sampler import BatchSampler
+from solver import Solver
+from nash import Nash, TOLERANCE
+from payoff import PayoffTable
+from profiler import Profiler, timed
+from table import Table
+import numpy as np
+import os
+
+# process pool shared by every Strategy, started on first use, with the constants its workers copied when it started
+POOL = None
+POOL_SETTINGS = None
+
+class Strategy:
+
+    def __init__(self, root: Board, profiler: Profiler=None):
+        """
+        :param root: board whose next two moves make up the payoff table
+        :param profiler: Profiler that collects counters and stage timings, none by default
+        """
+        self.root = root
+        self.profiler = profiler
+        self.children = []
+        self.payoff_table = PayoffTable()
+        self.first_player = -1
+        self.second_player = -1
+        self.player1_strategies = np.full(C.TOTAL_STRATEGIES, -1, dtype=int)
+        self.player2_strategies = np.full(C.TOTAL_STRATEGIES, -1, dtype=int)
+        self.solver = Solver.shared() if C.EXACT else None
+
+    @timed
+    def process(self):
+        """
+        Processes valid game states for sampling and creating a payoff table.
+        """
+
+        # Gather the root state's children
+        self.children = self.find_children(self.root)
+
+        # Initialize the payoff table
+        self.initialize_table()
+
+        # Monte Carlo Sampling
+        self.process_children()
+
+    def find_dominant_strategies(self) -> ([int], [int]):
+        """
+        Collects the dominant strategies marked by compare_strategies
+        :return: the first player's and the second player's dominant strategies
+        """
+        p1_dominant_strategies = np.flatnonzero(self.player1_strategies == 1).tolist()
+        p2_dominant_strategies = np.flatnonzero((self.player2_strategies == 1) &
+                                                (self.player1_strategies != 1)).tolist()
+
+        return p1_dominant_strategies, p2_dominant_strategies
+
+    def dominant_strategies(self):
+        """
+        Prints whether any dominant strategies exist for either player
+        """
+        p1_dominant_strategies, p2_dominant_strategies = self.find_dominant_strategies()
+
+        # display dominant strategies
+        print('\nDOMINANT STRATEGIES: ')
+        print(f'PLAYER {self.piece(self.first_player)}\'s strategies: {p1_dominant_strategies}')
+        print(f'PLAYER {self.piece(self.second_player)}\'s strategies: {p2_dominant_strategies}\n')
+
+    @timed
+    def compare_strategies(self):
+        """
+        Compares winning and stalemate outcomes based on sampling, defining if a strategy is dominant for a player
+        """
+        self.player1_strategies, self.player2_strategies = self.payoff_table.dominance()
+
+    @timed
+    def nash_equilibria(self) -> [(np.ndarray, np.ndarray, float, float)]:
+        """
+        Finds the Nash equilibria of the payoff table, where each player's payoff is its share of wins minus
+        its share of losses
+        :return: (first player's mixed strategy, second player's mixed strategy, first player's value,
+                 second player's value) of every equilibrium, each mixed strategy giving the probability of
+                 playing each position
+        """
+        return Nash(self.payoff_table).equilibria()
+
+    def display_equilibria(self, equilibria: [(np.ndarray, np.ndarray, float, float)]):
+        """
+        Prints the Nash equilibria of the payoff table, once each after rounding
+        :param equilibria: equilibria from nash_equilibria
+        """
+        print('NASH EQUILIBRIA: ')
+        printed = set()
+        same_square = False
+        for first, second, first_value, second_value in equilibria:
+            first_mix = {int(p): round(float(first[p]), 3) for p in np.flatnonzero(first > TOLERANCE)}
+            second_mix = {int(p): round(float(second[p]), 3) for p in np.flatnonzero(second > TOLERANCE)}
+            line = (f'PLAYER {self.piece(self.first_player)} plays {first_mix}, '
+                    f'PLAYER {self.piece(self.second_player)} plays {second_mix}, '
+                    f'values ({round(first_value, 3)}, {round(second_value, 3)})')
+            if line not in printed:
+                printed.add(line)
+                print(line)
+                same_square |= not first_mix.keys().isdisjoint(second_mix)
+        if not equilibria:
+            print('none')
+
+        # PayoffTable.matrices scores a reply on the square just taken as a uniformly random legal reply
+        if same_square:
+            print(f'(a PLAYER {self.piece(self.second_player)} position that PLAYER {self.piece(self.first_player)} '
+                  f'has just taken stands for a random legal reply)')
+        print()
+
+    @staticmethod
+    def piece(value: int) -> str:
+        """
+        Convert integer value of piece into the string equivalent for the game
+         0 ~> 'X'
+         1 ~> 'O'
+        -2 ~> ' '
+        :param value: integer representation of piece
+        :return: string representation of piece
+        """
+        if value < 0:
+            return ' '
+        if value > 0:
+            return 'O'
+        return 'X'
+
+    @timed
+    def initialize_table(self):
+        """
+        Initialize payoff table with specified dimensions
+        """
+        # the table covers the first player's moves on the root board and the second player's replies
+        first_player = self.children[0][1] if self.children else -1
+        legal_positions = [position for _, _, position, _ in self.children]
+        self.payoff_table = PayoffTable(first_player, self.other_player(first_player), legal_positions)
+
+    @timed
+    def process_children(self):
+        """
+        Processes each child to see if its board still has legal moves remaining. If not, the payoff is set.
+        If legal moves remain, the children's children are processed. If an end game state is not encountered,
+        the boards are run with monte carlo sampling and their payoff values are decided. The strategy combinations
+        and payoffs are saved in the payoff table.
+        """
+        pending = []    # cells whose boards are sampled once the whole table is known
+
+        # go through all of player 1's legal moves
+        for board, self.first_player, p1_position, legal_positions in self.children:
+            moves_remain = True
+            payoff = (-1, -1 , -1)
+            self.second_player = self.other_player(self.first_player)
+            _, winner = board.winning_state(self.first_player, p1_position)
+
+            # if a stalemate is encountered or a winner exists,
+            # run sampling with True Boolean to indicate no more legal moves remain
+            if len(legal_positions) < 1 or winner == 0 or winner == 1:
+                moves_remain = False
+                payoff = self.monte_carlo_sampling(board, self.first_player, p1_position, moves_remain=moves_remain)
+
+                self.payoff_table.decide(p1_position, payoff)
+                if self.profiler is not None:
+                    self.profiler.count('cells decided', len(self.children) - 1)
+
+            # If valid moves remain, go through all of them to represent player 2's reponses
+            if moves_remain:
+                for position in range(len(legal_positions)):
+                    moves_remain = True
+                    sample_board = board.copy()
+                    _, winner = sample_board.add_piece(self.second_player, position=legal_positions[position])
+
+                    if winner == 0 or winner == 1:
+                        moves_remain = False
+                        payoff = self.monte_carlo_sampling(sample_board, self.second_player, legal_positions[position],
+                                                           moves_remain=moves_remain)
+                    # look up the exact payoff, or leave the board to be sampled with the other cells
+                    if moves_remain and C.EXACT:
+                        payoff = self.solver.payoff(sample_board)
+                    elif moves_remain:
+                        pending.append((p1_position, legal_positions[position], sample_board, self.second_player,
+                                        legal_positions[position]))
+
+                    if self.profiler is not None:
+                        self.profiler.count('board copies')
+                        self.profiler.count('cells decided' if not moves_remain else
+                                            'cells solved' if C.EXACT else 'cells sampled')
+
+                    # save the payoff to the strategy pair it belongs to, sampled cells once they are sampled
+                    if not moves_remain or C.EXACT:
+                        self.payoff_table.set(p1_position, legal_positions[position], payoff, solved=moves_remain)
+
+        # sample every cell that is still in play
+        if pending:
+            cells = [(board, piece, position) for _, _, board, piece, position in pending]
+            if C.ADAPTIVE:
+                payoffs, samples, errors = self.sample_adaptively(cells)
+            else:
+                payoffs = self.sample_cells(cells)
+                samples = [C.SAMPLES] * len(cells)
+                lower, upper = self.confidence_bounds(np.array(payoffs, dtype=np.int64).reshape((-1, 3)))
+                errors = [tuple(round(float(e), 4) for e in error) for error in (upper - lower) / 2]
+
+            for (p1_position, p2_position, _, _, _), payoff, count, error in zip(pending, payoffs, samples, errors):
+                self.payoff_table.set(p1_position, p2_position, payoff, count, error)
+
+    @timed
+    def sample_cells(self, cells: [(Board or BitBoard, int, int)]) -> [(int, int, int)]:
+        """
+        Samples the boards of every open cell in the payoff table. The rollouts of each cell are split into
+        chunks of CHUNK_SAMPLES and every chunk gets its own random stream spawned from the SEED constant,
+        so sampling the chunks one after the other or on a process pool gives identical payoffs.
+        :param cells: (board, most recent piece added, where it was added) for each cell
+        :return: payoff values for each cell, in order
+        """
+        seed = np.random.SeedSequence(C.SEED)
+        owners = []
+        tasks = []
+        for cell, (board, piece, position) in enumerate(cells):
+            for chunk, first in enumerate(range(0, C.SAMPLES, C.CHUNK_SAMPLES)):
+                stream = np.random.SeedSequence(seed.entropy, spawn_key=(cell, chunk))
+                owners.append(cell)
+                tasks.append((board, piece, position, min(C.CHUNK_SAMPLES, C.SAMPLES - first), stream))
+
+        results = self.run_tasks(tasks, self.open_pool())
+
+        totals = np.zeros((len(cells), 3), dtype=np.int64)
+        for owner, payoff in zip(owners, results):
+            totals[owner] += payoff
+        return [tuple(int(total) for total in payoff) for payoff in totals]
+
+    @timed
+    def sample_adaptively(self, cells: [(Board or BitBoard, int, int)]) -> ([(int, int, int)], [int], [(float,)]):
+        """
+        Samples the open cells in rounds of ROUND_SAMPLES until each one can stop. A cell stops once the confidence
+        intervals of its X, O and stalemate proportions no longer overlap, so the comparisons made by
+        compare_strategies are settled. Otherwise it keeps getting rollouts until every interval is within PRECISION
+        or it has MAX_SAMPLES. Every round of a cell gets its own random stream spawned from the SEED constant.
+        :param cells: (board, most recent piece added, where it was added) for each cell
+        :return: payoff values, number of samples and confidence interval half-widths for each cell, in order
+        """
+        seed = np.random.SeedSequence(C.SEED)
+        totals = np.zeros((len(cells), 3), dtype=np.int64)
+        active = np.ones(len(cells), dtype=bool)
+        sampling_round = 0
+
+        pool = self.open_pool()
+        while active.any():
+            owners = np.flatnonzero(active)
+            tasks = [cells[cell] + (min(C.ROUND_SAMPLES, C.MAX_SAMPLES - int(totals[cell].sum())),
+                                    np.random.SeedSequence(seed.entropy, spawn_key=(int(cell), sampling_round)))
+                     for cell in owners]
+            totals[owners] += np.array(self.run_tasks(tasks, pool), dtype=np.int64)
+            sampling_round += 1
+
+            lower, upper = self.confidence_bounds(totals)
+            precise = (upper - lower).max(axis=1) <= 2 * C.PRECISION
+            active &= ~self.settled(lower, upper) & ~precise & (totals.sum(axis=1) < C.MAX_SAMPLES)
+
+        lower, upper = self.confidence_bounds(totals)
+        payoffs = [tuple(int(total) for total in payoff) for payoff in totals]
+        errors = [tuple(round(float(e), 4) for e in error) for error in (upper - lower) / 2]
+        return payoffs, [int(count) for count in totals.sum(axis=1)], errors
+
+    @staticmethod
+    def confidence_bounds(totals: np.ndarray) -> (np.ndarray, np.ndarray):
+        """
+        Wilson score intervals of the X won, O won and stalemate proportions at the CONFIDENCE z-score
+        :param totals: payoff counts of shape (cells, 3)
+        :return: lower and upper bounds, each of shape (cells, 3)
+        """
+        samples = np.maximum(totals.sum(axis=1, keepdims=True), 1)
+        p = totals / samples
+        z2 = C.CONFIDENCE ** 2
+        center = (p + z2 / (2 * samples)) / (1 + z2 / samples)
+        half_width = C.CONFIDENCE / (1 + z2 / samples) * np.sqrt(p * (1 - p) / samples + z2 / (4 * samples ** 2))
+        return np.clip(center - half_width, 0, 1), np.clip(center + half_width, 0, 1)
+
+    @staticmethod
+    def settled(lower: np.ndarray, upper: np.ndarray) -> np.ndarray:
+        """
+        Checks if the intervals compared by compare_strategies (X to O, stalemate to X, stalemate to O) are disjoint
+        :param lower: lower bounds of shape (cells, 3)
+        :param upper: upper bounds of shape (cells, 3)
+        :return: True for each cell whose comparisons can no longer change
+        """
+        settled = np.ones(len(lower), dtype=bool)
+        for first, second in ((0, 1), (2, 0), (2, 1)):
+            settled &= (lower[:, first] > upper[:, second]) | (lower[:, second] > upper[:, first])
+        return settled
+
+    @staticmethod
+    def open_pool() -> ProcessPoolExecutor or None:
+        """
+        Starting a pool costs far more than sampling a small payoff table, so a single pool is kept for the life of
+        the process and shared by every Strategy. It is only replaced when a constant has changed since its workers
+        copied them, as they would otherwise sample with stale settings.
+        :return: the shared process pool of WORKERS processes if PARALLEL is set, otherwise None
+        """
+        global POOL, POOL_SETTINGS
+        workers = (C.WORKERS or os.cpu_count()) if C.PARALLEL else 1
+        if workers < 2:
+            return None
+
+        settings = (workers,) + tuple((name, value) for name, value in vars(C).items() if name.isupper())
+        if POOL is None or POOL_SETTINGS != settings:
+            if POOL is not None:
+                POOL.shutdown()
+            POOL = ProcessPoolExecutor(max_workers=workers)
+            POOL_SETTINGS = settings
+        return POOL
+
+    def run_tasks(self, tasks: [(Board or BitBoard, int, int, int, np.random.SeedSequence)],
+                  pool: ProcessPoolExecutor=None) -> [(int, int, int)]:
+        """
+        Samples chunks of rollouts in this process or spread over the workers of a pool
+        :param tasks: (board, most recent piece added, where it was added, number of samples, seed of the stream)
+        :param pool: process pool from open_pool, or None to sample in this process
+        :return: payoff values for each task, in order
+        """
+        workers = (C.WORKERS or os.cpu_count()) if pool is not None else 1
+
+        # every job gets its own profiler when profiling, as workers cannot report to this process' profiler
+        def job_profiler() -> Profiler or None:
+            """
+            :return: a new Profiler for a job if this strategy is profiled, None otherwise
+            """
+            return Profiler() if self.profiler is not None else None
+
+        # the batched sampler runs an interleaved group of chunks per worker, otherwise each chunk is its own task
+        if C.BATCH:
+            run = self.sample_batch
+            jobs = [(tasks[first::workers], job_profiler()) for first in range(workers)]
+        else:
+            run = self.sample_chunk
+            jobs = [task + (job_profiler(),) for task in tasks]
+
+        if pool is not None:
+            results = list(pool.map(run, jobs, chunksize=max(1, len(jobs) // (4 * workers))))
+        else:
+            results = list(map(run, jobs))
+
+        results, profilers = map(list, zip(*results)) if results else ([], [])
+        if self.profiler is not None:
+            for profiler in profilers:
+                self.profiler.merge(profiler)
+
+        if C.BATCH:
+            grouped = results
+            results = [None] * len(tasks)
+            for first, group in enumerate(grouped):
+                results[first::workers] = group
+        return results
+
+    @staticmethod
+    def sample_chunk(task: (Board or BitBoard, int, int, int, np.random.SeedSequence, Profiler)) \
+            -> ((int, int, int), Profiler):
+        """
+        Samples one chunk of a cell's rollouts with the chunk's own random stream
+        :param task: (board, most recent piece added, where it was added, number of samples, seed of the stream,
+                     profiler or None)
+        :return: payoff values for the chunk and the task's profiler
+        """
+        board, _, _, samples, seed, profiler = task
+        rng = Random(int(seed.generate_state(1, np.uint64)[0]))
+
+        # the chunk is timed as the stage it stands in for, without building a Strategy for every chunk
+        with profiler.time('monte_carlo_sampling') if profiler is not None else nullcontext():
+            return Strategy.sample(board, samples, rng, profiler), profiler
+
+    @staticmethod
+    def sample_batch(job: ([(Board or BitBoard, int, int, int, np.random.SeedSequence)], Profiler)) \
+            -> ([(int, int, int)], Profiler):
+        """
+        Samples a group of chunks with the batched sampler, each chunk drawing from its own random stream
+        :param job: tasks of (board, most recent piece added, where it was added, number of samples,
+                    seed of the stream), and a profiler or None
+        :return: payoff values for each chunk, in order, and the job's profiler
+        """
+        tasks, profiler = job
+        if len(tasks) < 1:
+            return [], profiler
+        boards, _, _, counts, seeds = zip(*tasks)
+        sampler = BatchSampler(profiler=profiler)
+        return sampler.sample_cells(boards, counts, [np.random.default_rng(seed) for seed in seeds]), profiler
+
+    @timed
+    def monte_carlo_sampling(self, board: Board or BitBoard, piece: int, position: int, moves_remain: bool=True,
+                             samples: int=None, rng: Random=None) -> (int, int, int):
+        """
+        Sample from board state a constant number of times
+        :param board: the current board to sample
+        :param piece: most recent piece added
+        :param position: where most recent piece was added
+        :param moves_remain: True if there are more legal moves in the current board, False otherwise
+        :param samples: number of samples, the SAMPLES constant by default
+        :param rng: random generator for the sampled moves, the global one by default
+        :return: payoff values for current board
+        """
+        # if there were no legal moves after player 1 placed its piece
+        if not moves_remain:
+            _, winner = board.winning_state(piece, position)
+            return self.game_state(winner)
+
+        return self.sample(board, C.SAMPLES if samples is None else samples, rng, self.profiler)
+
+    @staticmethod
+    def sample(board: Board or BitBoard, samples: int, rng: Random=None, profiler: Profiler=None) -> (int, int, int):
+        """
+        Plays random rollouts from a board that is still in play
+        :param board: the board to sample, left unchanged
+        :param samples: number of samples
+        :param rng: random generator for the sampled moves, the global one by default
+        :param profiler: Profiler that counts the rollouts, plies and board copies, none by default
+        :return: payoff values for the board
+        """
+        # run game SAMPLE number of times while collecting (p1 won, p2 won, stalemate) samples
+        count = 0
+        p1_total = 0
+        p2_total = 0
+        stalemates = 0
+
+        if samples < 0:
+            raise ValueError(f'SAMPLES constant in constant.py must be 0 or more, not {samples}.')
+
+        # bitboard rollouts leave the board unchanged, so a single conversion replaces a copy per sample
+        if C.BITBOARD and not isinstance(board, BitBoard):
+            board = BitBoard.from_board(board)
+        if profiler is not None:
+            profiler.count('rollouts', samples)
+            profiler.count('board copies', 0 if C.BITBOARD else samples)
+
+        while count < samples:
+            p1_won, p2_won, no_win = Strategy.rollout(board if C.BITBOARD else deepcopy(board), rng, profiler)
+            if (p1_won, p2_won, no_win) == (-1, -1, -1):
+                raise ValueError('An error occurred with the gameplay. These values should not be returned')
+            p1_total += p1_won
+            p2_total += p2_won
+            stalemates += no_win
+            count += 1
+        return p1_total, p2_total, stalemates
+
+    def sample_run(self, board: Board or BitBoard, rng: Random=None) -> (int, int, int):
+        """
+        Uses the provided board state to start a sample run and continues until an end state is reached.
+        The end result concluding whether O won, X won, or stalemate was reached is returned
+        :param board: the current game board, which is played on unless it is a BitBoard
+        :param rng: random generator for the moves, the global one by default
+        :return: An integer 1 representing whether there was a win or stalemate, zeros for all other possible outcomes
+                 A triplet of (-1, -1, -1) is returned if there was an error in the gameplay
+        """
+        return self.rollout(board, rng, self.profiler)
+
+    @staticmethod
+    def rollout(board: Board or BitBoard, rng: Random=None, profiler: Profiler=None) -> (int, int, int):
+        """
+        Plays random moves from the board until an end state is reached
+        :param board: the current game board, which is played on unless it is a BitBoard
+        :param rng: random generator for the moves, the global one by default
+        :param profiler: Profiler that counts the plies, none by default
+        :return: payoff values of the single rollout, as in sample_run
+        """
+        if isinstance(board, BitBoard):
+            winner = board.rollout(rng, profiler)
+            if winner == 0:
+                return 1, 0, 0  # X won
+            if winner == 1:
+                return 0, 1, 0  # O won
+            return 0, 0, 1      # stalemate
+
+        end_game = False
+
+        # run the game until an endgame is reached
+        while not end_game:
+            position = board.random_legal_move(rng)
+            player = board.get_current_player()
+            player = board.alternate_player(player)
+            _, winner = board.add_piece(player, position)
+            if profiler is not None and winner != -1:
+                profiler.count('plies')
+            if winner == -1:
+                end_game = True
+                return 0, 0, 1  # stalemate
+            elif winner == 0:
+                end_game = True
+                return 1, 0, 0  # X won
+            elif winner == 1:
+                end_game = True
+                return 0, 1, 0  # O won
+
+        return -1, -1 ,-1
+
+    def game_state(self, winner: int) -> (int, int, int):
+        """
+        Returns payoff if board game will no longer change based on winner value
+        :param winner: value of winner where O wins all, X wins all, or stalemate
+        :return: payoff values
+        """
+        if winner == 0:
+            return (C.SAMPLES, 0, 0)
+        if winner == 1:
+            return (0, C.SAMPLES, 0)
+        return (0, 0, C.SAMPLES)
+
+    def other_player(self, piece: int) -> int:
+        """
+        Set the value of player 2's piece inferred from player 1's piece
+        :param piece: value of first player's piece
+        :return value of second player's piece
+        """
+        if piece == 0:
+            return 1
+        return 0
+
+    @timed
+    def find_children(self, board: Board) -> [Board]:
+        """
+        Finds all possible child states based on the board state
+        :param board: current board
+        :return A list of children board states stemming out from current board
+        """
+        children = board.discover_children()
+        if self.profiler is not None and children:
+            self.profiler.count('board copies', len(children))
+        return children
+
+    @timed
+    def generate_payoff_table(self) -> PayoffTable:
+        """
+        Displays the payoff table
+        :return the payoff table
+        """
+        table = Table(self.payoff_table)
+        table.display_table()
+        if self.solver is not None:
+            self.display_minimax()
+        return self.payoff_table
+
+    def display_minimax(self):
+        """
+        Prints the value under optimal play of the root and of each of the first player's moves, which the exact
+        payoffs of uniformly random play leave out
+        """
+        values = {position: self.solver.minimax(board) for board, _, position, _ in self.children}
+        print(f'\nMINIMAX (1 if X wins, -1 if O wins, 0 for stalemate under optimal play): '
+              f'{self.solver.minimax(self.root)}')
+        print(f'after each of PLAYER {self.piece(self.first_player)}\'s moves: {values}')
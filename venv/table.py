@@ -0,0 +1,169 @@
+from payoff import PayoffTable
+import constant as C
+from math import log10, ceil
+
+class Table:
+    """
+    Human-readable view of a PayoffTable. Rows of strings are only rendered when they are read: row 0 lists the
+    second player's strategies, and table[p1 + 1][p2 + 1] is the cell of a strategy pair.
+    """
+
+    def __init__(self, payoffs: PayoffTable):
+        """
+        :param payoffs: payoff table to display (first player's strategies are listed in left-hand column,
+        and second player's strategy is listed on first row)
+        """
+        self.payoffs = payoffs
+        self.first_player, self.second_player = self.represent_players((payoffs.first_player,
+                                                                        payoffs.second_player))
+        self.legal_positions = payoffs.legal_positions
+        self.y_axis_length = len(self.legal_positions)
+        self.x_axis_length = self.y_axis_length - 1
+
+        const_string_length = 9
+        padding = int(ceil(log10(max(C.SAMPLES, 1))))
+        self.cell_length = const_string_length + padding + len(str(C.SAMPLES))
+        self.max_length = (self.cell_length + 1) * (C.TOTAL_STRATEGIES + 1)
+
+    def __len__(self) -> int:
+        """
+        :return: number of rows of the table, the header included
+        """
+        return C.TOTAL_STRATEGIES + 1
+
+    def __getitem__(self, row: int) -> []:
+        """
+        :param row: 0 for the header, or the first player's strategy + 1
+        :return: the strategy followed by the text of each cell in the row, None for absent strategy pairs
+        """
+        if not 0 <= row < len(self):
+            raise IndexError(f'row {row} is not in the payoff table')
+        if row == 0:
+            return ['Strategies'] + list(range(C.TOTAL_STRATEGIES))
+        samples = self.payoffs.samples[row - 1].tolist()
+        errors = self.payoffs.errors[row - 1].tolist()
+        return [row - 1] + [self.describe(payoff, count, error)
+                            for payoff, count, error in zip(self.payoffs.row(row - 1), samples, errors)]
+
+    @property
+    def payoff_table(self) -> [[str]]:
+        """
+        :return: the rows of the table, as built by create_human_readable_table
+        """
+        return self.create_human_readable_table()
+
+    def pretty_print(self, item: str):
+        """
+        Pretty prints the item passed in so that the overall matrix looks pretty and is more easily readable
+        :param item: item of string type
+        """
+
+        # if the item is empty or of None value, print empty spaces
+        if not item:
+            item = '|' + (self.cell_length * ' ')
+            print(item, end='')
+
+        # otherwise, pad the item appropriately
+        else:
+            item_length = len(item)
+            extra_spaces = self.cell_length - item_length
+            left_spaces = extra_spaces // 2
+            right_spaces = extra_spaces - left_spaces
+            pretty_item = '|' + (left_spaces * ' ') + item + (right_spaces * ' ')
+            print(pretty_item, end='')
+
+    def print_header(self):
+        """
+        Prints payoff table title
+        """
+
+        # Print Title
+        title = 'PAYOFF TABLE     (' + str(self.first_player) + '\'s wins, ' + \
+                str(self.second_player) + '\'s wins, stalemates)'
+        title_len = len(title)
+        extra_spaces = self.max_length - title_len
+        left_spaces = extra_spaces // 2
+        right_spaces = extra_spaces - left_spaces
+        title_details = (left_spaces * ' ') + title + (right_spaces * ' ')
+        print(title_details, end='')
+        self.print_border_line()
+
+        # Print Player Details
+        player_details = 'Player ' + str(self.first_player) + ' represented by rows (left to right), ' \
+                         'Player ' + str(self.second_player) + ' represented by columns (top to bottom)'
+
+        player_details_len = len(player_details)
+        extra_spaces = self.max_length - player_details_len
+        left_spaces = extra_spaces // 2
+        right_spaces = extra_spaces - left_spaces
+        player_details_details = (left_spaces * ' ') + player_details + (right_spaces * ' ')
+        print(player_details_details, end='')
+
+    def print_border_line(self, breakline: bool=True):
+        """
+        Prints a border line
+        :param breakline: adds a newline if True, no newline if False
+        """
+        if breakline:
+            print('\n' + (self.max_length * '-'))
+        else:
+            print((self.max_length * '-'))
+
+    def display_table(self):
+        """
+        Displays the entire Payoff Table in a human-readable format
+        """
+        payoff_table = self.create_human_readable_table()
+
+        # widen the cells if a payoff is longer than expected, e.g. fractional payoffs from the exact solver
+        longest = max((len(str(cell)) for row in payoff_table[1:] for cell in row[1:] if cell), default=0)
+        if longest + 2 > self.cell_length:
+            self.cell_length = longest + 2
+            self.max_length = (self.cell_length + 1) * (C.TOTAL_STRATEGIES + 1)
+
+        self.print_header()
+
+        for payoff in payoff_table:
+            self.print_border_line()
+            for p in payoff:
+                self.pretty_print(str(p))
+        self.print_border_line()
+
+    def create_human_readable_table(self) -> [[str]]:
+        """
+        Renders the entire Payoff Table in a human-readable format
+        :return: every row of the table, starting with the header
+        """
+        return [self[row] for row in range(len(self))]
+
+    @staticmethod
+    def describe(payoff: (float, float, float), samples: int, error: (float, float, float)=None) -> str or None:
+        """
+        :param payoff: payoff values of a cell in the payoff table, None if the strategy pair is not in the table
+        :param samples: number of samples behind the payoff
+        :param error: confidence interval half-widths of the cell's X won, O won and stalemate proportions
+        :return: the cell's payoff, followed by its number of samples and error bounds when they vary between cells
+        """
+        if payoff is None:
+            return None
+        if C.ADAPTIVE and samples:
+            if error is None or any(e != e for e in error):
+                return f'{payoff} n={samples}'
+            return f'{payoff} n={samples} ±{tuple(round(e, 3) for e in error)}'
+        return str(payoff)
+
+    def represent_players(self, player_order) -> str:
+        """
+        Returns the pieces that represent each player
+        :param player_order: the first and second player's values
+        :return the first player's pice, the second player's piece (e.g. X, O)
+        """
+        players = ['', '']
+
+        for i in range(len(player_order)):
+            if player_order[i] == 0:
+                players[i] = 'X'
+            elif player_order[i] == 1:
+                players[i] = 'O'
+
+        return players[0], players[1]
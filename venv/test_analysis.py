@@ -0,0 +1,64 @@
+from analysis import Analysis, ColumnarWriter, COLUMNS, JsonWriter, parse_board, read_boards, read_columnar
+import io
+import json
+import numpy as np
+import pytest
+
+BOARDS = ('X...O....', 'X.O.X....', '.X..O....', 'XO..X..O.')
+
+
+def test_parse_board():
+    assert parse_board('X.O-_..OX').tolist() == [0, -1, 1, -1, -1, -1, -1, 1, 0]
+    assert parse_board('[[0, -1, 1], [-1, -1, -1], [-1, 1, 0]]').tolist() == [0, -1, 1, -1, -1, -1, -1, 1, 0]
+    with pytest.raises(ValueError):
+        parse_board('X.O')
+    with pytest.raises(ValueError):
+        parse_board('X.O.Z....')
+
+
+def test_cache_repeats_result(settings):
+    analysis = Analysis()
+    first = analysis.analyze(parse_board(BOARDS[0]))
+    second = analysis.analyze(parse_board(BOARDS[0]))
+    assert not first['cached'] and second['cached']
+    assert analysis.analyzed == 1 and analysis.cached == 1
+    for column in COLUMNS:
+        assert np.array_equal(first[column], second[column], equal_nan=True)
+
+
+def test_cache_is_bounded(settings):
+    analysis = Analysis()
+    record = analysis.analyze(parse_board(BOARDS[0]))
+    analysis = Analysis(cache_bytes=Analysis.size(record))
+    for board in BOARDS:
+        analysis.analyze(parse_board(board))
+        assert analysis.cache_used <= analysis.cache_bytes
+    assert list(analysis.cache) == [parse_board(BOARDS[-1]).tobytes()]
+
+
+def test_unique_skips_repeats(settings):
+    lines = [BOARDS[0], BOARDS[1], BOARDS[0], 'XX.......', BOARDS[1]]
+    for unique, written in ((False, 4), (True, 2)):
+        stream = io.StringIO()
+        Analysis(unique=unique).run(read_boards(lines), JsonWriter(stream))
+        results = [json.loads(line) for line in stream.getvalue().splitlines()]
+        assert sum('error' in result for result in results) == 1
+        assert len([result for result in results if 'error' not in result]) == written
+
+
+def test_columnar_round_trip(settings):
+    analysis = Analysis()
+    records = [analysis.analyze(parse_board(board)) for board in BOARDS]
+    stream = io.BytesIO()
+    writer = ColumnarWriter(stream, block_size=3)
+    for record in records:
+        writer.write(record)
+    writer.close()
+
+    stream.seek(0)
+    blocks = list(read_columnar(stream))
+    assert [len(block['board']) for block in blocks] == [3, 1]
+    for column in COLUMNS:
+        values = np.concatenate([block[column] for block in blocks])
+        assert np.array_equal(values, np.stack([record[column] for record in records]), equal_nan=True)
+    assert not np.isnan(blocks[0]['errors']).all()
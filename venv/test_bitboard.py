@@ -0,0 +1,53 @@
+from bitboard import BitBoard
+from board import Board
+from random import Random
+from strategy import Strategy
+import numpy as np
+
+
+def test_games_match_board(settings):
+    rng = Random(3)
+    for _ in range(200):
+        board, bitboard = Board(child=True), BitBoard(child=True)
+        piece = 0
+        result = (1, 2)
+        while result == (1, 2):
+            assert bitboard.collect_legal_positions() == board.collect_legal_positions()
+            position = rng.choice(board.collect_legal_positions() or [0])
+            result = board.add_piece(piece, position)
+            assert bitboard.add_piece(piece, position) == result
+            assert np.array_equal(bitboard.state, board.state)
+            piece = 1 - piece
+        assert bitboard.end_game == board.end_game and bitboard.winning_player == board.winning_player
+
+
+def test_play_undo_restores_board(settings):
+    rng = Random(5)
+    board = BitBoard(child=True)
+    board.play(0, 4)
+    before = board.copy()
+    for _ in range(100):
+        played = []
+        piece = 1
+        for _ in range(rng.randrange(1, len(board.open) + 1)):
+            position = rng.choice(board.open)
+            board.play(piece, position)
+            played.append((piece, position))
+            piece = 1 - piece
+        for piece, position in reversed(played):
+            board.undo(piece, position)
+
+        assert board.masks == before.masks and board.empty == before.empty
+        assert sorted(board.open) == sorted(before.open)
+        assert all(board.open[board.slot[position]] == position for position in board.open)
+        assert board.move_count == before.move_count and board.current_player == before.current_player
+        assert not board.end_game and board.winning_player == -1
+
+
+def test_rollouts_match_board(settings):
+    state = np.array([[0, -1, -1], [-1, 1, -1], [-1, -1, -1]])
+    outcomes = {}
+    for bitboard in (False, True):
+        settings.BITBOARD = bitboard
+        outcomes[bitboard] = np.array(Strategy.sample(Board(state.copy(), 2, 1, child=True), 4000, Random(1))) / 4000
+    assert np.allclose(outcomes[False], outcomes[True], atol=0.04)
@@ -0,0 +1,84 @@
+from bitboard import BitBoard
+from game import Game
+from mcts import MCTS
+from strategy import Strategy
+from random import Random
+import numpy as np
+import pytest
+
+# X to move with 0 and 1 taken, so 2 wins at once
+X_WINS = [0, 0, -1, 1, 1, -1, -1, -1, -1]
+
+# O to move against X's 0 and 1, so 2 has to be blocked
+O_BLOCKS = [0, 0, -1, -1, -1, -1, -1, -1, 1]
+
+
+def make_board(state: [int], to_move: int) -> BitBoard:
+    return BitBoard(np.array(state, dtype=np.int8), current_player=to_move, child=True)
+
+
+@pytest.mark.parametrize('samples, iterations', [(200, 500), (1000, 2000)])
+def test_seeded_search_takes_winning_move(settings, samples, iterations):
+    settings.SAMPLES = samples
+    board = make_board(X_WINS, 0)
+    strategy = Strategy(board.copy())
+    strategy.process()
+
+    for seed in range(5):
+        mcts = MCTS(board, 0, Random(seed))
+        mcts.seed(strategy.payoff_table)
+        position, stats = mcts.search(iterations)
+        assert position == 2
+        assert stats['values'][2] == 1.0
+
+
+def test_search_takes_winning_move():
+    board = make_board(X_WINS, 0)
+    for seed in range(5):
+        assert MCTS(board, 0, Random(seed)).search(500)[0] == 2
+
+
+def test_search_blocks_losing_move():
+    board = make_board(O_BLOCKS, 1)
+    for seed in range(5):
+        assert MCTS(board, 1, Random(seed)).search(2000)[0] == 2
+
+
+def test_advance_keeps_searched_subtree():
+    mcts = MCTS(BitBoard(child=True), 0, Random(1))
+    position, stats = mcts.search(300)
+    child = mcts.root.children[position]
+
+    mcts.advance(position)
+    assert mcts.root is child and child.parent is None
+    assert mcts.root.visits == stats['visits'][position]
+    assert mcts.search(100)[1]['reused'] == stats['visits'][position]
+
+
+def test_advance_builds_root_for_unsearched_move():
+    mcts = MCTS(BitBoard(child=True), 0, Random(1))
+    mcts.advance(4)
+    assert mcts.root.piece == 0 and mcts.root.visits == 0
+    assert mcts.root.board.state.ravel().tolist() == [-1, -1, -1, -1, 0, -1, -1, -1, -1]
+    assert mcts.search(50)[1]['player'] == 1
+
+
+def test_search_rejects_empty_budget():
+    mcts = MCTS(BitBoard(child=True), 0, Random(1))
+    with pytest.raises(ValueError):
+        mcts.search(0)
+    with pytest.raises(ValueError):
+        mcts.search(seconds=0)
+    assert mcts.search(seconds=1e-9)[1]['iterations'] >= 1
+
+
+def test_game_reuses_tree(settings):
+    settings.MOVES = 0
+    settings.MCTS_ITERATIONS = 200
+    game = Game(mcts_players=(0, 1), rng=Random(3))
+    for _ in range(2):
+        game.next_move()
+        game.switch_player()
+    first, second = game.move_stats
+    assert first['reused'] == 0 and second['reused'] > 0
+    assert game.mcts.root.board.state.ravel().tolist() == game.board.state.ravel().tolist()
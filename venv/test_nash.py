@@ -0,0 +1,51 @@
+from nash import Nash, TOLERANCE
+import numpy as np
+import pytest
+
+
+def check_equilibrium(nash: Nash, first_mix: np.ndarray, second_mix: np.ndarray, value: float):
+    """
+    Checks that neither player can do better than the value by moving away from its mixed strategy
+    """
+    x, y = first_mix[nash.positions], second_mix[nash.positions]
+    assert x.sum() == pytest.approx(1) and y.sum() == pytest.approx(1)
+    assert (x @ nash.first).min() >= value - 1e-9
+    assert (nash.first @ y).max() <= value + 1e-9
+
+
+def test_equilibria_are_best_responses(settings, make_boards, process):
+    settings.SEED = 21
+    for board in make_boards(4, seed=8):
+        nash = Nash(process(board).payoff_table)
+        equilibria = nash.equilibria()
+        assert equilibria
+        for first_mix, second_mix, first_value, second_value in equilibria:
+            check_equilibrium(nash, first_mix, second_mix, first_value)
+            assert second_value == pytest.approx(-first_value)
+            assert first_value == pytest.approx(equilibria[0][2])
+
+            # leftovers of the linear solves are removed
+            assert not ((first_mix > 0) & (first_mix <= TOLERANCE)).any()
+
+
+def test_linear_program_matches_enumeration(settings, make_boards, process):
+    settings.SEED = 5
+    for board in make_boards(3, seed=9):
+        nash = Nash(process(board).payoff_table)
+        enumerated = nash.equilibria()
+        first_mix, second_mix, first_value, _ = nash.maximin()
+        check_equilibrium(nash, first_mix, second_mix, first_value)
+        assert first_value == pytest.approx(enumerated[0][2], abs=1e-9)
+
+
+def test_large_tables_use_linear_program(settings, make_boards, process):
+    settings.SEED = 6
+    table = process(make_boards(1, seed=1)[0]).payoff_table
+    equilibria = Nash(table, max_pairs=1).equilibria()
+    assert len(equilibria) == 1
+    check_equilibrium(Nash(table), *equilibria[0][:3])
+
+
+def test_count():
+    assert [Nash.count(9, size) for size in range(10)] == [1, 9, 36, 84, 126, 126, 84, 36, 9, 1]
+    assert Nash.count(3, 5) == 0
@@ -0,0 +1,72 @@
+import constant as C
+from payoff import PayoffTable
+from strategy import Strategy
+import numpy as np
+
+
+def loop_dominance(strategy: Strategy) -> (np.ndarray, np.ndarray):
+    """
+    Marks dominant strategies cell by cell, in the order and with the rules compare_strategies applied before
+    the payoff table became arrays, where a row whose first move ended the game held cells without a second move
+    :param strategy: processed strategy
+    :return: the first player's and the second player's strategies, as in PayoffTable.dominance
+    """
+    table = strategy.payoff_table
+    player1_strategies = np.full(C.TOTAL_STRATEGIES, -1, dtype=int)
+    player2_strategies = np.full(C.TOTAL_STRATEGIES, -1, dtype=int)
+
+    for _, _, p1_strategy, legal_positions in strategy.children:
+        for position in legal_positions:
+            p1, p2, stalemate = table.payoff(p1_strategy, position)
+            p2_strategy = None if table.decided[p1_strategy] else position
+
+            if p2_strategy is None:
+                player2_strategies[table.legal_positions] = 0
+            else:
+                if p2 > p1:
+                    player1_strategies[p1_strategy] = 0
+                    if player2_strategies[p1_strategy] != 0:
+                        player2_strategies[p1_strategy] = 1
+                if stalemate >= p2:
+                    player2_strategies[p2_strategy] = 0
+
+            if stalemate >= p1:
+                player1_strategies[p1_strategy] = 0
+            elif p1 > p2:
+                if player1_strategies[p1_strategy] != 0:
+                    player1_strategies[p1_strategy] = 1
+                if p2_strategy is None:
+                    player2_strategies[table.legal_positions] = 0
+                else:
+                    player2_strategies[p2_strategy] = 0
+
+    return player1_strategies, player2_strategies
+
+
+def test_dominance_matches_loop(settings, make_boards, process):
+    settings.SAMPLES = 12
+    settings.SEED = 7
+    for board in make_boards(20, seed=11):
+        strategy = process(board)
+        player1_strategies, player2_strategies = loop_dominance(strategy)
+        assert np.array_equal(strategy.player1_strategies, player1_strategies)
+        assert np.array_equal(strategy.player2_strategies, player2_strategies)
+
+
+def test_save_and_load(tmp_path, settings, make_boards, process):
+    settings.SEED = 3
+    for board in make_boards(1, seed=2)[3:5]:
+        table = process(board).payoff_table
+        table.save(tmp_path / 'table.npz')
+        loaded = PayoffTable.load(tmp_path / 'table.npz')
+        for name, array in table.arrays().items():
+            assert np.array_equal(array, loaded.arrays()[name], equal_nan=True)
+        assert loaded.row(table.legal_positions[0]) == table.row(table.legal_positions[0])
+
+
+def test_matrices_fill_taken_square_with_row_average(settings, make_boards, process):
+    table = process(make_boards(1, seed=4)[1]).payoff_table
+    first, second = table.matrices()
+    assert np.array_equal(second, -first)
+    off_diagonal = ~np.eye(len(first), dtype=bool)
+    assert np.allclose(np.diag(first), (first * off_diagonal).sum(axis=1) / off_diagonal.sum(axis=1))
@@ -0,0 +1,58 @@
+from bitboard import BitBoard
+from sampler import BatchSampler
+from solver import Solver
+from random import Random
+import json
+import numpy as np
+import os
+import subprocess
+import sys
+
+# samples each 4x4 board with 3 in a row with the bitboard and batched samplers. The engines fix their cells and
+# winning lines when they are imported, so the board size is set in a fresh interpreter before importing them.
+MNK_SCRIPT = '''
+import constant as C
+C.ROWS, C.COLUMNS, C.IN_A_ROW = 4, 4, 3
+C.TOTAL_STRATEGIES = C.ROWS * C.COLUMNS
+from bitboard import BitBoard
+from sampler import BatchSampler
+from random import Random
+import json
+import numpy as np
+
+board = BitBoard(np.array([0, -1, -1, -1, -1, 1, -1, -1, -1, -1, 0, -1, -1, -1, -1, -1]), 3, 0, child=True)
+rng = Random(1)
+rollouts = [board.rollout(rng) for _ in range(SAMPLES)]
+batch = BatchSampler(SAMPLES, np.random.default_rng(1)).sample(board)
+print(json.dumps([[rollouts.count(0), rollouts.count(1), rollouts.count(-1)], batch]))
+'''
+
+
+def test_batch_matches_solver(settings, make_boards):
+    solver = Solver.shared()
+    # children of the random boards, whose current player is the one that just moved
+    boards = [child for board in make_boards(1, seed=8) for child, _, _, legal in board.discover_children()
+              if legal and not child.end_game]
+    sampler = BatchSampler(20000, np.random.default_rng(4))
+    assert boards
+    for board, payoff in zip(boards, sampler.sample_cells(boards)):
+        assert sum(payoff) == 20000
+        assert np.allclose(np.array(payoff) / 20000, solver.outcomes(board), atol=0.02)
+
+
+def test_batch_matches_rollouts_on_mnk_board():
+    samples = 20000
+    result = subprocess.run([sys.executable, '-c', MNK_SCRIPT.replace('SAMPLES', str(samples))],
+                            cwd=os.path.dirname(os.path.abspath(__file__)), capture_output=True, text=True, check=True)
+    rollouts, batch = np.array(json.loads(result.stdout)) / samples
+    assert np.allclose(rollouts, batch, atol=0.02)
+
+
+def test_rngs_keep_boards_independent(settings):
+    board = BitBoard(np.array([0, -1, -1, -1, 1, -1, -1, -1, -1]), 2, 1, child=True)
+    other = BitBoard(np.array([0, 1, 0, -1, -1, -1, -1, -1, -1]), 3, 0, child=True)
+    sampler = BatchSampler(500)
+    alone = sampler.sample_cells([board], rngs=[np.random.default_rng(Random(2).getrandbits(32))])
+    together = sampler.sample_cells([other, board], rngs=[np.random.default_rng(9),
+                                                         np.random.default_rng(Random(2).getrandbits(32))])
+    assert together[1] == alone[0]
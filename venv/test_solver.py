@@ -0,0 +1,34 @@
+from bitboard import BitBoard
+from solver import Solver
+from strategy import Strategy
+import numpy as np
+import pytest
+
+
+def test_empty_board():
+    solver = Solver.shared()
+    board = BitBoard(child=True)
+    assert solver.outcomes(board) == pytest.approx((0.5849, 0.2881, 0.1270), abs=5e-5)
+    assert solver.minimax(board) == 0
+
+
+def test_symmetric_boards_share_outcomes():
+    solver = Solver.shared()
+    corners = [BitBoard(np.array(state, dtype=np.int8), current_player=1, child=True)
+               for state in ([0, -1, -1, -1, -1, -1, -1, -1, -1], [-1, -1, -1, -1, -1, -1, -1, -1, 0])]
+    assert solver.outcomes(corners[0]) == solver.outcomes(corners[1])
+
+
+def test_minimax_of_won_and_forced_boards():
+    solver = Solver.shared()
+    x_wins_next = BitBoard(np.array([0, 0, -1, 1, 1, -1, -1, -1, -1], dtype=np.int8), current_player=0, child=True)
+    x_won = BitBoard(np.array([0, 0, 0, 1, 1, -1, -1, -1, -1], dtype=np.int8), current_player=1, child=True)
+    assert solver.minimax(x_wins_next) == 1
+    assert solver.minimax(x_won) == 1
+    assert solver.outcomes(x_won) == (1.0, 0.0, 0.0)
+
+
+def test_solver_is_loaded_once(settings):
+    settings.EXACT = True
+    assert Solver.shared() is Solver.shared()
+    assert Strategy(BitBoard(child=True)).solver is Strategy(BitBoard(child=True)).solver
@@ -0,0 +1,70 @@
+from strategy import Strategy
+import numpy as np
+import pytest
+
+
+@pytest.mark.parametrize('batch, adaptive', [(False, False), (True, False), (False, True)])
+def test_parallel_matches_serial(settings, make_boards, process, batch, adaptive):
+    settings.SEED = 1234
+    settings.BATCH = batch
+    settings.ADAPTIVE = adaptive
+    boards = make_boards(2, seed=5)
+
+    tables = {}
+    for parallel in (False, True):
+        settings.PARALLEL = parallel
+        settings.WORKERS = 2
+        tables[parallel] = [process(board).payoff_table for board in boards]
+
+    for serial, parallel in zip(tables[False], tables[True]):
+        assert np.array_equal(serial.payoffs, parallel.payoffs, equal_nan=True)
+        assert np.array_equal(serial.samples, parallel.samples)
+
+
+def test_seed_repeats_payoffs(settings, make_boards, process):
+    settings.SEED = 99
+    board = make_boards(1, seed=3)[2]
+    first, second = process(board).payoff_table, process(board).payoff_table
+    assert np.array_equal(first.payoffs, second.payoffs, equal_nan=True)
+
+
+def test_pool_is_shared(settings):
+    settings.PARALLEL = True
+    settings.WORKERS = 2
+    pool = Strategy.open_pool()
+    assert Strategy.open_pool() is pool
+
+    # workers copy the constants when they start, so changing one replaces the pool
+    settings.SAMPLES += 1
+    assert Strategy.open_pool() is not pool
+
+
+def test_adaptive_cells_stop(settings, make_boards, process):
+    settings.SEED = 7
+    settings.ADAPTIVE = True
+    settings.ROUND_SAMPLES = 16
+    settings.MAX_SAMPLES = 160
+    sampled = early = 0
+    for board in make_boards(2, seed=11):
+        table = process(board).payoff_table
+        cells = table.samples > 0
+        totals = table.payoffs[cells].astype(np.int64)
+        samples = table.samples[cells]
+        assert np.array_equal(totals.sum(axis=1), samples)
+        assert (samples <= settings.MAX_SAMPLES).all()
+        assert ((samples % settings.ROUND_SAMPLES == 0) | (samples == settings.MAX_SAMPLES)).all()
+
+        # every cell stopped for a reason: settled comparisons, tight intervals or the sample limit
+        lower, upper = Strategy.confidence_bounds(totals)
+        assert np.allclose(table.errors[cells], (upper - lower) / 2, atol=1e-4)
+        precise = (upper - lower).max(axis=1) <= 2 * settings.PRECISION
+        assert (Strategy.settled(lower, upper) | precise | (samples == settings.MAX_SAMPLES)).all()
+        sampled += len(samples)
+        early += int((samples < settings.MAX_SAMPLES).sum())
+    assert sampled and early
+
+
+def test_settled_intervals():
+    lower = np.array([[0.6, 0.1, 0.0], [0.4, 0.3, 0.0]])
+    upper = np.array([[0.8, 0.3, 0.05], [0.6, 0.5, 0.1]])
+    assert Strategy.settled(lower, upper).tolist() == [True, False]
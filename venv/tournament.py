@@ -0,0 +1,171 @@
+import constant as C
+from game import Game
+from concurrent.futures import ProcessPoolExecutor
+from random import Random
+from time import perf_counter
+import argparse
+import json
+import os
+import random
+import sys
+import numpy as np
+
+# engines a player can choose its moves with
+PLAYERS = ('mcts', 'random')
+
+# settings every worker process copies before playing its games. The board size is left out, as the engines fix
+# their cells and winning lines when they are imported, so it has to be set in constant.py
+SETTINGS = ('MOVES', 'BITBOARD', 'MCTS_ITERATIONS', 'MCTS_SECONDS', 'EXPLORATION')
+
+
+def play(task: (int, (int,), int, dict)) -> dict:
+    """
+    Plays a single game from a board with MOVES random moves in
+    :param task: (number of the game, pieces that move with MCTS, seed of the game, settings of the constants)
+    :return: the winner and the number of moves of the game, and the totals of its MCTS moves
+    """
+    number, mcts_players, seed, settings = task
+    for name, value in settings.items():
+        setattr(C, name, value)
+
+    # the starting board comes from the global generator, the moves and rollouts from the game's own
+    random.seed(seed)
+    game = Game(mcts_players, Random(seed))
+    state, winner = game.running()
+    while state > 0:
+        game.next_move()
+        state, winner = game.running()
+        game.switch_player()
+
+    return {'game': number, 'winner': winner, 'moves': len(game.actual_strategies),
+            'mcts_moves': len(game.move_stats),
+            'iterations': sum(stats['iterations'] for stats in game.move_stats),
+            'reused': sum(stats['reused'] for stats in game.move_stats),
+            'search_seconds': sum(stats['seconds'] for stats in game.move_stats)}
+
+
+class Tournament:
+    """
+    Plays many games between two players, each choosing its moves with MCTS or at random, and records the
+    results along with the throughput in games and moves per second
+    """
+
+    def __init__(self, x: str='mcts', o: str='mcts', seed: int=0):
+        """
+        :param x: engine of X, one of PLAYERS
+        :param o: engine of O, one of PLAYERS
+        :param seed: seed every game's seed is spawned from
+        """
+        self.players = {'X': x, 'O': o}
+        self.mcts_players = tuple(piece for piece, player in enumerate((x, o)) if player == 'mcts')
+        self.seed = seed
+        self.results = []
+        self.seconds = 0.0
+
+    def run(self, games: int, workers: int=1):
+        """
+        Plays the games, spread over a process pool if there is more than one worker
+        :param games: number of games
+        :param workers: worker processes, every CPU if 0
+        """
+        settings = {name: getattr(C, name) for name in SETTINGS}
+        seed = np.random.SeedSequence(self.seed)
+        tasks = [(number, self.mcts_players,
+                  int(np.random.SeedSequence(seed.entropy, spawn_key=(number,)).generate_state(1)[0]), settings)
+                 for number in range(games)]
+
+        workers = workers or os.cpu_count()
+        start = perf_counter()
+        if workers > 1:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                self.results = list(pool.map(play, tasks, chunksize=max(1, games // (workers * 8))))
+        else:
+            self.results = [play(task) for task in tasks]
+        self.seconds = perf_counter() - start
+
+    def summary(self) -> dict:
+        """
+        :return: JSON-serializable wins, throughput and search totals of the games played
+        """
+        games = len(self.results)
+        moves = sum(result['moves'] for result in self.results)
+        mcts_moves = sum(result['mcts_moves'] for result in self.results)
+        winners = [result['winner'] for result in self.results]
+        return {
+            'players': self.players,
+            'games': games,
+            'X': winners.count(0),
+            'O': winners.count(1),
+            'stalemate': winners.count(-1),
+            'moves': moves,
+            'seconds': self.seconds,
+            'games_per_sec': games / max(self.seconds, 1e-12),
+            'moves_per_sec': moves / max(self.seconds, 1e-12),
+            'mcts_moves': mcts_moves,
+            'mean_iterations': sum(result['iterations'] for result in self.results) / max(mcts_moves, 1),
+            'mean_reused': sum(result['reused'] for result in self.results) / max(mcts_moves, 1),
+            'mean_search_ms': sum(result['search_seconds'] for result in self.results) * 1000 / max(mcts_moves, 1),
+        }
+
+    def report(self) -> dict:
+        """
+        :return: the summary along with the settings the games were played with and the result of every game
+        """
+        return {'settings': {name: getattr(C, name) for name in ('ROWS', 'COLUMNS', 'IN_A_ROW') + SETTINGS},
+                'seed': self.seed,
+                'summary': self.summary(), 'results': self.results}
+
+    def display(self):
+        """
+        Prints the wins of each player and the throughput
+        """
+        summary = self.summary()
+        games = max(summary['games'], 1)
+        print(f'X ({self.players["X"]}) vs O ({self.players["O"]}): {summary["games"]} games')
+        for outcome in ('X', 'O', 'stalemate'):
+            print(f'{outcome:>10}: {summary[outcome]:>7} ({summary[outcome] / games:.1%})')
+        print(f'{summary["games_per_sec"]:,.1f} games/sec, {summary["moves_per_sec"]:,.1f} moves/sec '
+              f'over {summary["seconds"]:.2f}s')
+        if summary['mcts_moves']:
+            print(f'{summary["mean_iterations"]:,.0f} iterations and {summary["mean_search_ms"]:.2f} ms per MCTS move, '
+                  f'{summary["mean_reused"]:,.0f} visits reused from the previous move')
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Plays a tournament of games between MCTS and random players.')
+    parser.add_argument('-x', choices=PLAYERS, default='mcts', help='engine of X (default: mcts)')
+    parser.add_argument('-o', choices=PLAYERS, default='mcts', help='engine of O (default: mcts)')
+    parser.add_argument('-g', '--games', type=int, default=1000, help='number of games (default: 1000)')
+    parser.add_argument('-i', '--iterations', type=int, help='search iterations per move (default: MCTS_ITERATIONS)')
+    parser.add_argument('-t', '--seconds', type=float, help='search time per move, replaces the iterations')
+    parser.add_argument('-m', '--moves', type=int, default=0, help='random moves into the game of the starting boards')
+    parser.add_argument('-w', '--workers', type=int, default=1, help='worker processes, every CPU if 0 (default: 1)')
+    parser.add_argument('--seed', type=int, default=0, help='seed of the games')
+    parser.add_argument('--engine', choices=('bitboard', 'numpy'), help='board engine (default: BITBOARD)')
+    parser.add_argument('--output', help='file to write the results to')
+    args = parser.parse_args()
+    if args.iterations is not None and args.iterations < 1:
+        parser.error('--iterations must be at least 1')
+    if args.seconds is not None and args.seconds <= 0:
+        parser.error('--seconds must be positive')
+
+    if args.engine is not None:
+        C.BITBOARD = args.engine == 'bitboard'
+    if args.iterations is not None:
+        C.MCTS_ITERATIONS = args.iterations
+    if args.seconds is not None:
+        C.MCTS_SECONDS = args.seconds
+    C.MOVES = args.moves
+
+    tournament = Tournament(args.x, args.o, args.seed)
+    tournament.run(args.games, args.workers)
+    tournament.display()
+
+    if args.output:
+        with open(args.output, 'w') as file:
+            json.dump(tournament.report(), file, indent=2)
+        print(f'\nresults written to {args.output}', file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()